@@ -41,8 +41,20 @@ def simulate_beat_frequency(f1=440, f2=444, A1=1.0, A2=1.0, t_start=0, t_end=1,
 
         plt.tight_layout()
         plt.show()
+import asyncio
+import time
+import wave as wavfile
+from collections import deque
+
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy.fft import next_fast_len
+from scipy.signal import hilbert
+
+try:
+    from src.cache_utils import ArrayCache
+except ImportError:  # 以脚本方式运行时 src 目录本身位于 sys.path 中
+    from cache_utils import ArrayCache
 
 
 def create_time_array(t_start, t_end, num_points):
@@ -57,36 +69,239 @@ def generate_sine_waves(f1, f2, A1, A2, t):
     return wave1, wave2
 
 
+array_cache = ArrayCache()
+
+
+def cached_time_array(t_start, t_end, num_points):
+    """带缓存的 create_time_array, 返回只读数组"""
+    key = ('t', float(t_start), float(t_end), int(num_points))
+    return array_cache.get(key, lambda: create_time_array(t_start, t_end, num_points))
+
+
+def cached_sine_wave(f, A, t_start, t_end, num_points):
+    """带缓存的单个正弦波 A * sin(2*pi*f*t), 返回只读数组"""
+    key = ('wave', float(f), float(A), float(t_start), float(t_end), int(num_points))
+    return array_cache.get(key, lambda: A * np.sin(2 * np.pi * f * cached_time_array(t_start, t_end, num_points)))
+
+
+def cached_sine_waves(f1, f2, A1, A2, t_start, t_end, num_points):
+    """带缓存的 generate_sine_waves, 按时间参数而非时间数组索引"""
+    return (cached_sine_wave(f1, A1, t_start, t_end, num_points),
+            cached_sine_wave(f2, A2, t_start, t_end, num_points))
+
+
 def superpose_waves(wave1, wave2):
     """叠加两个正弦波"""
     return wave1 + wave2
 
 
+def superpose_partials(frequencies, amplitudes, t, phases=None, dtype=np.float64, cache_bytes=4 * 1024 * 1024):
+    """
+    叠加任意多个正弦分量: sum_k A_k * sin(2*pi*f_k*t + phi_k)
+
+    按采样点分块累加到同一个输出数组中, 每块只生成 (分量数 x 块长) 的小矩阵,
+    其大小由 cache_bytes 控制, 不会构造完整的 (分量数 x 采样点数) 矩阵。
+    dtype=np.float32 时相位先在 float64 下去掉整周期, 再以 float32 计算 sin 和累加。
+    t 可以是任意形状, 返回与 t 形状相同的数组。
+    """
+    frequencies = np.atleast_1d(np.asarray(frequencies, dtype=float))
+    amplitudes = np.broadcast_to(np.asarray(amplitudes, dtype=float), frequencies.shape)
+    phases = np.zeros_like(frequencies) if phases is None else np.broadcast_to(
+        np.asarray(phases, dtype=float), frequencies.shape)
+    t = np.asarray(t, dtype=float)
+    shape = t.shape
+    t = t.ravel()
+    dtype = np.dtype(dtype)
+
+    weights = amplitudes.astype(dtype)
+    out = np.empty(t.shape, dtype=dtype)
+    chunk = max(1, min(t.size, cache_bytes // (8 * max(1, frequencies.size))))
+    # 相位 2*pi*f*t + phi 写成 [2*pi*f, phi] @ [t; 1], 一次矩阵乘法直接写入复用的缓冲区
+    if dtype == np.float64:
+        coeffs = np.column_stack([2 * np.pi * frequencies, phases])
+    else:
+        # 以周期数表示相位, 之后去掉整数部分, 避免大相位在 float32 下丢失精度
+        coeffs = np.column_stack([frequencies, phases / (2 * np.pi)])
+    basis = np.ones((2, chunk))
+    arg = np.empty((frequencies.size, chunk))
+    arg32 = None if dtype == np.float64 else np.empty((frequencies.size, chunk), dtype=dtype)
+    for start in range(0, t.size, chunk):
+        stop = min(start + chunk, t.size)
+        n = stop - start
+        basis[0, :n] = t[start:stop]
+        block = np.matmul(coeffs, basis[:, :n], out=arg[:, :n])
+        if arg32 is not None:
+            block -= np.floor(block)
+            block = arg32[:, :n]
+            block[...] = arg[:, :n]
+            block *= dtype.type(2 * np.pi)
+        np.sin(block, out=block)
+        np.dot(weights, block, out=out[start:stop])
+    return out.reshape(shape)
+
+
 def calculate_beat(f1, f2):
     """计算拍频"""
     return np.abs(f1 - f2)
 
 
-def plot_waves(t, wave1, wave2, superposed_wave, beat_frequency, f1, f2, A1, A2):
-    """绘制波形图"""
+def extract_envelope(superposed_wave):
+    """用解析信号 (FFT 实现的 Hilbert 变换) 提取包络, 变换长度补零到 FFT 友好的长度后再截回"""
+    superposed_wave = np.asarray(superposed_wave, dtype=float)
+    n = superposed_wave.size
+    return np.abs(hilbert(superposed_wave, next_fast_len(n))[:n])
+
+
+def _dominant_frequency(signal, sample_rate, min_peak_ratio=0.0):
+    """
+    加 Hann 窗并补零做 rfft, 用抛物线插值给出最强非直流分量的频率
+
+    主峰幅度不足频谱中位数的 min_peak_ratio 倍时视为没有明显周期分量, 返回 nan。
+    """
+    n = signal.size
+    n_fft = next_fast_len(4 * n, real=True)
+    spectrum = np.abs(np.fft.rfft((signal - signal.mean()) * np.hanning(n), n_fft))
+    # 跳过窗长内不足一个半周期的低频段 (主要是直流泄漏)
+    lowest = int(np.ceil(1.5 * n_fft / n))
+    if lowest >= spectrum.size - 1:
+        return np.nan
+    k = lowest + np.argmax(spectrum[lowest:-1])
+    if not spectrum[k] > min_peak_ratio * np.median(spectrum[lowest:]):
+        return np.nan
+    a, b, c = np.log(spectrum[k - 1:k + 2] + 1e-300)
+    denom = a - 2 * b + c
+    offset = 0.5 * (a - c) / denom if denom != 0 else 0.0
+    return (k + offset) * sample_rate / n_fft
+
+
+def _envelope_beat_frequency(envelope, sample_rate, min_depth=5e-3, min_peak_ratio=20.0):
+    """
+    由包络估计拍频; 没有拍 (静音、单一纯音或纯噪声) 时返回 nan
+
+    包络的调制深度 std/mean 只在去掉两端各 10% 后计算, 以排除 Hilbert 变换的边缘振荡;
+    深度低于 min_depth, 或包络频谱主峰不足中位数的 min_peak_ratio 倍时判定为无拍。
+    """
+    trim = envelope.size // 10
+    core = envelope[trim:envelope.size - trim]
+    mean = core.mean() if core.size else 0.0
+    if not mean > 0 or core.std() < min_depth * mean:
+        return np.nan
+    return _dominant_frequency(envelope, sample_rate, min_peak_ratio)
+
+
+def estimate_beat_frequency(superposed_wave, t, min_depth=5e-3, min_peak_ratio=20.0):
+    """
+    直接从采样信号估计拍频, 返回 (beat_frequency, envelope)
+
+    包络由 Hilbert 变换得到, 拍频取包络频谱的主峰频率, 总复杂度 O(n log n)。
+    信号中没有可辨认的拍时 beat_frequency 为 nan, 阈值含义见 _envelope_beat_frequency。
+    """
+    superposed_wave = np.asarray(superposed_wave, dtype=float)
+    sample_rate = (len(t) - 1) / (t[-1] - t[0])
+    envelope = extract_envelope(superposed_wave)
+    return _envelope_beat_frequency(envelope, sample_rate, min_depth, min_peak_ratio), envelope
+
+
+def estimate_beat_frequency_stream(blocks, sample_rate, window=65536, hop=None, min_depth=5e-3,
+                                   min_peak_ratio=20.0):
+    """
+    流式拍频估计: 依次读入信号块, 每块之后产出基于最近 window 个采样点的拍频估计
+
+    blocks 可以是 simulate_beat_frequency_stream 产生的 (t, wave) 块, 也可以直接是波形数组。
+    每累计 hop (默认 window // 4) 个新采样点才重新计算一次包络和频谱, 其间的块沿用上一次的估计,
+    因此每个采样点的平均开销与块长无关。窗口内没有可辨认的拍时产出 nan。
+    """
+    hop = window // 4 if hop is None else hop
+    buffer = np.empty(window)
+    filled = 0
+    pending = 0
+    estimate = np.nan
+    for block in blocks:
+        samples = np.asarray(block[1] if isinstance(block, tuple) else block, dtype=float)
+        pending += samples.size
+        samples = samples[-window:]
+        keep = min(filled, window - samples.size)
+        buffer[:keep] = buffer[filled - keep:filled]
+        buffer[keep:keep + samples.size] = samples
+        filled = keep + samples.size
+        if pending >= hop or filled == pending:
+            estimate = _envelope_beat_frequency(extract_envelope(buffer[:filled]), sample_rate, min_depth,
+                                                min_peak_ratio)
+            pending = 0
+        yield estimate
+
+
+def decimate_minmax(t, y, num_bins):
+    """
+    将信号恰好分成 num_bins 箱 (箱长相差至多 1), 每箱只保留最小值和最大值两个采样点 (按时间先后排列),
+    输出点数不超过 2 * num_bins
+
+    在每个像素对应一箱时, 折线的外观与绘制全部采样点一致。
+    """
+    t = np.asarray(t)
+    y = np.asarray(y)
+    n = y.size
+    if n <= 2 * num_bins:
+        return t, y
+    edges = np.linspace(0, n, num_bins + 1).astype(np.intp)
+    # 各箱补齐到最大箱长, 补齐位置在求最小值/最大值时不会被选中
+    idx = edges[:-1, None] + np.arange(np.diff(edges).max())
+    valid = idx < edges[1:, None]
+    np.minimum(idx, n - 1, out=idx)
+    values = y[idx]
+    i_min = np.where(valid, values, np.inf).argmin(axis=1)
+    i_max = np.where(valid, values, -np.inf).argmax(axis=1)
+    base = edges[:-1]
+    idx = np.column_stack([base + np.minimum(i_min, i_max), base + np.maximum(i_min, i_max)]).ravel()
+    return t[idx], y[idx]
+
+
+def plot_decimated(ax, t, y, num_bins=None, **kwargs):
+    """
+    在 ax 上绘制按像素 min/max 抽取后的信号, 缩放或平移时按可见范围重新抽取
+
+    num_bins 默认取坐标轴的像素宽度。
+    """
+    if num_bins is None:
+        num_bins = max(1, int(ax.get_window_extent().width))
+    line, = ax.plot(*decimate_minmax(t, y, num_bins), **kwargs)
+
+    def on_xlim_changed(axes):
+        x0, x1 = sorted(axes.get_xlim())
+        lo = max(np.searchsorted(t, x0) - 1, 0)
+        hi = min(np.searchsorted(t, x1) + 1, len(t))
+        line.set_data(*decimate_minmax(t[lo:hi], y[lo:hi], num_bins))
+
+    ax.callbacks.connect('xlim_changed', on_xlim_changed)
+    return line
+
+
+def plot_waves(t, wave1, wave2, superposed_wave, beat_frequency, f1, f2, A1, A2, decimate=False):
+    """绘制波形图, decimate=True 时使用按像素 min/max 抽取的快速绘制"""
     plt.figure(figsize=(12, 6))
 
+    def plot(y, label):
+        if decimate:
+            plot_decimated(plt.gca(), t, y, label=label)
+        else:
+            plt.plot(t, y, label=label)
+
     plt.subplot(3, 1, 1)
-    plt.plot(t, wave1, label=f'Wave 1 (f={f1} Hz, A={A1})')
+    plot(wave1, f'Wave 1 (f={f1} Hz, A={A1})')
     plt.title('Wave 1')
     plt.xlabel('Time (s)')
     plt.ylabel('Amplitude')
     plt.legend()
 
     plt.subplot(3, 1, 2)
-    plt.plot(t, wave2, label=f'Wave 2 (f={f2} Hz, A={A2})')
+    plot(wave2, f'Wave 2 (f={f2} Hz, A={A2})')
     plt.title('Wave 2')
     plt.xlabel('Time (s)')
     plt.ylabel('Amplitude')
     plt.legend()
 
     plt.subplot(3, 1, 3)
-    plt.plot(t, superposed_wave, label=f'Superposed Wave (Beat f={beat_frequency} Hz)')
+    plot(superposed_wave, f'Superposed Wave (Beat f={beat_frequency} Hz)')
     plt.title('Superposed Wave')
     plt.xlabel('Time (s)')
     plt.ylabel('Amplitude')
@@ -96,7 +311,8 @@ def plot_waves(t, wave1, wave2, superposed_wave, beat_frequency, f1, f2, A1, A2)
     plt.show()
 
 
-def simulate_beat_frequency(f1=440, f2=444, A1=1.0, A2=1.0, t_start=0, t_end=1, num_points=5000, show_plot=True):
+def simulate_beat_frequency(f1=440, f2=444, A1=1.0, A2=1.0, t_start=0, t_end=1, num_points=5000, show_plot=True,
+                            decimate=False):
     """
     模拟并可视化两个正弦波叠加产生的拍频现象
     """
@@ -106,21 +322,238 @@ def simulate_beat_frequency(f1=440, f2=444, A1=1.0, A2=1.0, t_start=0, t_end=1,
     beat_frequency = calculate_beat(f1, f2)
 
     if show_plot:
-        plot_waves(t, wave1, wave2, superposed_wave, beat_frequency, f1, f2, A1, A2)
+        plot_waves(t, wave1, wave2, superposed_wave, beat_frequency, f1, f2, A1, A2, decimate=decimate)
 
     return t, superposed_wave, beat_frequency
 
 
+def simulate_beat_frequency_stream(f1=440, f2=444, A1=1.0, A2=1.0, t_start=0, t_end=1, num_points=5000,
+                                   block_size=65536):
+    """
+    分块流式生成叠加波, 每次产出一个 (t, superposed_wave) 块
+
+    时间点按 t_start + i * dt 逐块计算 (dt 与 np.linspace 相同, 末点固定为 t_end),
+    相位由全局采样序号 i 决定, 因此块边界处相位连续, 拼接结果与
+    simulate_beat_frequency 的一次性结果逐位一致。内存占用只与 block_size 有关。
+    """
+    if block_size <= 0:
+        raise ValueError("block_size 必须为正整数")
+    step = (t_end - t_start) / (num_points - 1) if num_points > 1 else 0.0
+    for start in range(0, num_points, block_size):
+        stop = min(start + block_size, num_points)
+        t = np.arange(start, stop, dtype=float) * step + t_start
+        if stop == num_points and num_points > 1:
+            t[-1] = t_end
+        wave1, wave2 = generate_sine_waves(f1, f2, A1, A2, t)
+        yield t, superpose_waves(wave1, wave2)
+
+
+def export_beat_signal(path, f1=440, f2=444, A1=1.0, A2=1.0, t_start=0, t_end=1, num_points=5000,
+                       block_size=65536, sample_width=2, sample_rate=None):
+    """
+    将叠加波逐块写入磁盘, 不在内存中保存完整信号
+
+    path 以 .npy 结尾时写入内存映射的 float64 .npy 文件, 否则写入 WAV 文件。
+    WAV 为 16 位 (sample_width=2) 或 32 位 (sample_width=4) 整数 PCM, 按 |A1| + |A2| 归一化
+    (两者均为 0 时写入静音), 超出整数范围的采样点截断到范围内。采样率默认取
+    (num_points - 1) / (t_end - t_start) 四舍五入后的整数, 时长为 0 时须显式给出 sample_rate。
+    返回写入字节数和吞吐量 (MB/s)。
+    """
+    blocks = simulate_beat_frequency_stream(f1, f2, A1, A2, t_start, t_end, num_points, block_size)
+    start = time.perf_counter()
+    if str(path).endswith('.npy'):
+        out = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=(num_points,))
+        offset = 0
+        for _, block in blocks:
+            out[offset:offset + block.size] = block
+            offset += block.size
+        out.flush()
+        nbytes = out.nbytes
+        del out
+    else:
+        if sample_width not in (2, 4):
+            raise ValueError("sample_width 只能为 2 (16 位) 或 4 (32 位)")
+        if sample_rate is None:
+            if t_end == t_start or num_points < 2:
+                raise ValueError("信号时长为 0, 无法推断采样率, 请显式给出 sample_rate")
+            sample_rate = int(round((num_points - 1) / (t_end - t_start)))
+        dtype = np.dtype('<i2') if sample_width == 2 else np.dtype('<i4')
+        info = np.iinfo(dtype)
+        peak = abs(A1) + abs(A2)
+        scale = info.max / peak if peak > 0 else 0.0
+        with wavfile.open(str(path), 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(sample_width)
+            wav.setframerate(sample_rate)
+            for _, block in blocks:
+                samples = np.round(block * scale)
+                np.clip(samples, info.min, info.max, out=samples)
+                wav.writeframes(samples.astype(dtype).tobytes())
+        nbytes = num_points * sample_width
+    elapsed = time.perf_counter() - start
+    return {'bytes': nbytes, 'seconds': elapsed, 'mb_per_s': nbytes / 1e6 / elapsed}
+
+
+class BeatProducer:
+    """
+    实时拍频信号的 asyncio 生产者
+
+    后台任务以固定采样率逐块合成叠加波, 在容量为 buffer_blocks 的队列中保持若干预渲染块,
+    消费者通过 read(ms) 获取接下来 ms 毫秒的信号。两个波的相位以周期数累积,
+    set_parameters 修改的频率和振幅从下一个渲染块开始生效, 相位保持连续。
+    stats() 报告欠载次数和每块从开始渲染到交付消费者的延迟。
+    """
+
+    def __init__(self, f1=440, f2=444, A1=1.0, A2=1.0, sample_rate=44100, block_size=1024, buffer_blocks=4):
+        self.frequencies = np.array([f1, f2], dtype=float)
+        self.amplitudes = np.array([A1, A2], dtype=float)
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.underruns = 0
+        self.latencies = deque(maxlen=1000)
+        self._cycles = np.zeros(2)
+        self._local_t = np.arange(block_size) / sample_rate
+        self._queue = asyncio.Queue(maxsize=buffer_blocks)
+        self._pending = np.empty(0)
+        self._task = None
+
+    def set_parameters(self, f1=None, f2=None, A1=None, A2=None):
+        """修改频率或振幅, 未给出的参数保持不变"""
+        for i, value in ((0, f1), (1, f2)):
+            if value is not None:
+                self.frequencies[i] = value
+        for i, value in ((0, A1), (1, A2)):
+            if value is not None:
+                self.amplitudes[i] = value
+
+    def render_block(self):
+        """合成下一块信号并推进相位"""
+        block = superpose_partials(self.frequencies, self.amplitudes, self._local_t, 2 * np.pi * self._cycles)
+        self._cycles = (self._cycles + self.frequencies * self.block_size / self.sample_rate) % 1.0
+        return block
+
+    async def _produce(self):
+        while True:
+            start = time.perf_counter()
+            block = self.render_block()
+            await self._queue.put((start, block))
+            await asyncio.sleep(0)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._produce())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def read(self, ms):
+        """读取接下来 ms 毫秒的信号; 缓冲区为空时计一次欠载并等待生产者"""
+        n = int(round(ms * self.sample_rate / 1000))
+        parts = [self._pending[:n]]
+        have = parts[0].size
+        self._pending = self._pending[n:]
+        while have < n:
+            if self._queue.empty():
+                self.underruns += 1
+            start, block = await self._queue.get()
+            self.latencies.append(time.perf_counter() - start)
+            take = min(n - have, block.size)
+            parts.append(block[:take])
+            self._pending = block[take:]
+            have += take
+        return np.concatenate(parts)
+
+    def stats(self):
+        latencies = np.array(self.latencies)
+        return {'underruns': self.underruns, 'blocks': len(latencies),
+                'mean_latency': latencies.mean() if latencies.size else np.nan,
+                'max_latency': latencies.max() if latencies.size else np.nan}
+
+
+def benchmark_superpose_partials(num_partials=200, num_points=100000, repeat=3):
+    """比较逐分量循环与分块叠加引擎的吞吐量 (采样点·分量/秒)"""
+    rng = np.random.default_rng(0)
+    frequencies = rng.uniform(100, 1000, num_partials)
+    amplitudes = rng.uniform(0, 1, num_partials)
+    phases = rng.uniform(0, 2 * np.pi, num_partials)
+    t = create_time_array(0, 1, num_points)
+
+    def naive():
+        total = np.zeros_like(t)
+        for f, a, p in zip(frequencies, amplitudes, phases):
+            total = total + a * np.sin(2 * np.pi * f * t + p)
+        return total
+
+    methods = {
+        'naive loop': naive,
+        'chunked float64': lambda: superpose_partials(frequencies, amplitudes, t, phases),
+        'chunked float32': lambda: superpose_partials(frequencies, amplitudes, t, phases, dtype=np.float32),
+    }
+    results = {}
+    for name, method in methods.items():
+        best = np.inf
+        for _ in range(repeat):
+            start = time.perf_counter()
+            method()
+            best = min(best, time.perf_counter() - start)
+        results[name] = num_points * num_partials / best
+    return results
+
+
+def _sweep_rows(A1, amplitude_ratios, wave1, unit_wave2, out):
+    """把一组频率差对应的全部振幅比波形写入 out, 形状 (len(unit_wave2), len(amplitude_ratios), len(t))"""
+    A2 = A1 * np.asarray(amplitude_ratios, dtype=float)
+    np.multiply(A2[None, :, None], unit_wave2[:, None, :], out=out)
+    out += wave1
+    return out
+
+
+def sweep_beat_parameters(freq_diffs, amplitude_ratios, base_freq=440, A1=1.0, t_start=0, t_end=1,
+                          num_points=5000, chunk_rows=16):
+    """
+    对频率差和振幅比网格做向量化扫描
+
+    第二个波的频率为 base_freq + diff, 振幅为 A1 * ratio。时间数组和第一个波只计算一次,
+    结果通过广播按 chunk_rows 分块直接写入形状为 (n_diff, n_ratio, num_points) 的输出数组。
+    时间数组和各单频波取自 array_cache, 重复扫描时不再重新计算; 返回的 t 为只读数组。
+    """
+    freq_diffs = np.atleast_1d(np.asarray(freq_diffs, dtype=float))
+    amplitude_ratios = np.atleast_1d(np.asarray(amplitude_ratios, dtype=float))
+    t = cached_time_array(t_start, t_end, num_points)
+    wave1 = cached_sine_wave(base_freq, A1, t_start, t_end, num_points)
+
+    waves = np.empty((freq_diffs.size, amplitude_ratios.size, t.size))
+    for lo in range(0, freq_diffs.size, chunk_rows):
+        hi = min(lo + chunk_rows, freq_diffs.size)
+        unit_wave2 = np.stack([cached_sine_wave(base_freq + diff, 1.0, t_start, t_end, num_points)
+                               for diff in freq_diffs[lo:hi]])
+        _sweep_rows(A1, amplitude_ratios, wave1, unit_wave2, waves[lo:hi])
+    return t, waves
+
+
 def analyze_frequency_difference():
     """分析频率差对拍频现象的影响"""
     base_freq = 440
     freq_diffs = [1, 2, 5, 10]
+    t, waves = sweep_beat_parameters(freq_diffs, [1.0], base_freq=base_freq)
     plt.figure(figsize=(12, 8))
 
     for idx, diff in enumerate(freq_diffs, start=1):
-        t, wave, _ = simulate_beat_frequency(f1=base_freq, f2=base_freq + diff, show_plot=False)
         plt.subplot(2, 2, idx)
-        plt.plot(t, wave)
+        plt.plot(t, waves[idx - 1, 0])
         plt.title(f'Frequency diff = {diff} Hz')
         plt.xlabel('Time (s)')
         plt.ylabel('Amplitude')
@@ -132,12 +565,12 @@ def analyze_frequency_difference():
 def analyze_amplitude_ratio():
     """分析振幅比例对拍频现象的影响"""
     amplitude_ratios = [0.5, 1.0, 2.0, 5.0]
+    t, waves = sweep_beat_parameters([4], amplitude_ratios)
     plt.figure(figsize=(12, 8))
 
     for idx, ratio in enumerate(amplitude_ratios, start=1):
-        t, wave, _ = simulate_beat_frequency(A2=ratio, show_plot=False)
         plt.subplot(2, 2, idx)
-        plt.plot(t, wave)
+        plt.plot(t, waves[0, idx - 1])
         plt.title(f'Amplitude ratio = {ratio}')
         plt.xlabel('Time (s)')
         plt.ylabel('Amplitude')
@@ -154,8 +587,12 @@ def parameter_sensitivity_analysis():
 
 if __name__ == "__main__":
     print("=== 任务1: 基本拍频模拟 ===")
-    t, wave, beat_freq = simulate_beat_frequency()
+    t, wave_data, beat_freq = simulate_beat_frequency()
     print(f"计算得到的拍频为: {beat_freq} Hz")
 
     print("\n=== 任务2: 参数敏感性分析 ===")
     parameter_sensitivity_analysis()
+
+    print("\n=== 多分量叠加吞吐量 (采样点·分量/秒) ===")
+    for name, rate in benchmark_superpose_partials().items():
+        print(f"{name:<18}{rate:.3e}")
@@ -0,0 +1,46 @@
+from collections import OrderedDict
+
+
+class ArrayCache:
+    """按字节预算做 LRU 淘汰的数组缓存, 缓存的数组均为只读"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, compute):
+        """命中时直接返回缓存数组, 否则调用 compute() 计算并存入缓存"""
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        value = compute()
+        value.flags.writeable = False
+        if value.nbytes <= self.max_bytes:
+            self._data[key] = value
+            self.nbytes += value.nbytes
+            self._evict()
+        return value
+
+    def resize(self, max_bytes):
+        """修改字节预算, 超出部分立即淘汰"""
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def clear(self):
+        """清空缓存并重置计数"""
+        self._data.clear()
+        self.nbytes = self.hits = self.misses = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._data),
+                'nbytes': self.nbytes, 'max_bytes': self.max_bytes}
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes:
+            _, old = self._data.popitem(last=False)
+            self.nbytes -= old.nbytes
@@ -1,10 +1,21 @@
 import numpy as np
 from scipy.integrate import quad
+from scipy.interpolate import PchipInterpolator
+from scipy.optimize import minimize_scalar
+from scipy.special import erf, erfc, gamma, gammainc
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import json
+import math
+import os
 import time
 
 # 最概然速率 (m/s)
 vp = 1578
 
+# 摩尔气体常数 (J/(mol·K))
+R_GAS = 8.314462618
+
 # 麦克斯韦速率分布函数
 def maxwell_distribution(v, vp):
     return (4 / np.sqrt(np.pi)) * (v**2 / vp**3) * np.exp(-(v**2) / (vp**2))
@@ -24,41 +35,417 @@ def percentage_3e4_to_3e8(vp):
     result, _ = quad(maxwell_distribution, 3e4, 3e8, args=(vp,))
     return result * 100
 
-# 梯形积分法则
-def trapezoidal_rule(func, lower, upper, num_divisions):
+# 高斯项 2x/sqrt(pi) * exp(-x^2), x 为无穷大时取 0
+def _gaussian_term(x):
+    with np.errstate(invalid='ignore'):
+        term = (2 / np.sqrt(np.pi)) * x * np.exp(-x**2)
+    return np.where(np.isinf(x), 0.0, term)
+
+# 麦克斯韦速率分布的累积分布函数 (解析形式): F(x) = erf(x) - 2x/sqrt(pi) * exp(-x^2), x = v / vp
+def maxwell_cdf(v, vp):
+    x = np.asarray(v, dtype=float) / vp
+    return erf(x) - _gaussian_term(x)
+
+# 生存函数 1 - F, 用 erfc 计算, 在远尾处不会因相减而丢失精度
+def maxwell_sf(v, vp):
+    x = np.asarray(v, dtype=float) / vp
+    return erfc(x) + _gaussian_term(x)
+
+# 区间 [lower, upper] 内的概率, 参数可为任意可广播的数组, 无需数值积分
+# 下限超过 vp 时用生存函数之差, 否则用累积分布函数之差
+def interval_probability(lower, upper, vp):
+    lower, upper, vp = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (lower, upper, vp)))
+    in_tail = lower > vp
+    return np.where(in_tail, maxwell_sf(lower, vp) - maxwell_sf(upper, vp),
+                    maxwell_cdf(upper, vp) - maxwell_cdf(lower, vp))
+
+# 梯形积分法则 (逐点循环), 被积函数的额外参数通过 args 显式传入
+def trapezoidal_rule(func, lower, upper, num_divisions, args=()):
     step = (upper - lower) / num_divisions
-    total = 0.5 * (func(lower, vp) + func(upper, vp))
+    total = 0.5 * (func(lower, *args) + func(upper, *args))
     for i in range(1, num_divisions):
-        total += func(lower + i * step, vp)
+        total += func(lower + i * step, *args)
     return total * step
 
+# 分块计算加权和 sum(w_i * f(x_i)), 每块只生成 chunk_size 个节点, 内存占用与 n 无关
+def _chunked_weighted_sum(func, nodes_and_weights, count, args, chunk_size):
+    total = 0.0
+    for start in range(0, count, chunk_size):
+        x, w = nodes_and_weights(start, min(start + chunk_size, count))
+        total += np.dot(w, func(x, *args))
+    return total
+
+# 向量化复合梯形公式
+def trapezoid_vectorized(func, lower, upper, n, args=(), chunk_size=1 << 20):
+    step = (upper - lower) / n
+
+    def nodes_and_weights(start, stop):
+        i = np.arange(start, stop)
+        w = np.ones(i.size)
+        w[i == 0] = 0.5
+        w[i == n] = 0.5
+        return lower + i * step, w
+
+    return step * _chunked_weighted_sum(func, nodes_and_weights, n + 1, args, chunk_size)
+
+# 向量化复合 Simpson 公式, n 必须为偶数
+def simpson_vectorized(func, lower, upper, n, args=(), chunk_size=1 << 20):
+    if n % 2:
+        raise ValueError("Simpson 公式要求区间划分数 n 为偶数")
+    step = (upper - lower) / n
+
+    def nodes_and_weights(start, stop):
+        i = np.arange(start, stop)
+        w = np.where(i % 2 == 1, 4.0, 2.0)
+        w[(i == 0) | (i == n)] = 1.0
+        return lower + i * step, w
+
+    return step / 3 * _chunked_weighted_sum(func, nodes_and_weights, n + 1, args, chunk_size)
+
+# Gauss-Legendre 节点与权重 (区间 [-1, 1]), 按阶数缓存
+@lru_cache(maxsize=None)
+def gauss_legendre_nodes(order):
+    nodes, weights = np.polynomial.legendre.leggauss(order)
+    nodes.flags.writeable = False
+    weights.flags.writeable = False
+    return nodes, weights
+
+# 向量化复合 Gauss-Legendre 公式: 将区间等分为 n 段, 每段使用 order 点 Gauss-Legendre 求积
+def gauss_legendre(func, lower, upper, n, args=(), order=5, chunk_size=1 << 20):
+    step = (upper - lower) / n
+    nodes, weights = gauss_legendre_nodes(order)
+    panels_per_chunk = max(1, chunk_size // order)
+
+    def nodes_and_weights(start, stop):
+        left = lower + np.arange(start, stop) * step
+        x = (left[:, None] + 0.5 * step * (nodes + 1)).ravel()
+        return x, np.tile(weights, stop - start)
+
+    return 0.5 * step * _chunked_weighted_sum(func, nodes_and_weights, n, args, panels_per_chunk)
+
+# 按容差自动加密的 Romberg 积分: 每次将区间数加倍, 只计算新增的中点并复用已有函数值,
+# 再对梯形结果做 Richardson 外推; 相邻两级外推值之差小于 tol 时停止。
+# 返回 (积分值, 被积函数求值次数)
+def romberg_integrate(func, lower, upper, args=(), tol=1e-10, min_levels=4, max_levels=25):
+    step = upper - lower
+    evaluations = 2
+    row = [0.5 * step * (func(lower, *args) + func(upper, *args))]
+    for level in range(1, max_levels + 1):
+        count = 2 ** (level - 1)
+        midpoints = lower + (np.arange(count) + 0.5) * step
+        evaluations += count
+        new_row = [0.5 * row[0] + 0.5 * step * np.sum(func(midpoints, *args))]
+        for k in range(1, level + 1):
+            factor = 4 ** k
+            new_row.append((factor * new_row[k - 1] - row[k - 1]) / (factor - 1))
+        step /= 2
+        if level >= min_levels and abs(new_row[-1] - row[-1]) <= tol:
+            return new_row[-1], evaluations
+        row = new_row
+    return row[-1], evaluations
+
+# 使用 Romberg 积分计算任务 1, 返回 (百分比, 求值次数)
+def percentage_0_to_vp_romberg(vp, tol=1e-10):
+    result, evaluations = romberg_integrate(maxwell_distribution, 0, vp, args=(vp,), tol=tol)
+    return result * 100, evaluations
+
+# 尾部概率 P(v > c) 的严格上界: 由 erfc(x) <= exp(-x^2) / (x sqrt(pi)) 得
+# 1 - F(x) <= exp(-x^2) * (2x + 1/x) / sqrt(pi), x = c / vp > 0
+def maxwell_tail_bound(v, vp):
+    x = np.asarray(v, dtype=float) / vp
+    with np.errstate(over='ignore', divide='ignore'):
+        return np.where(x > 0, np.exp(-x**2) * (2 * x + 1 / x) / np.sqrt(np.pi), 1.0)
+
+# 尾部上界降到 tol 以下的截断速率 (不小于 vp), 由不动点迭代求解
+def maxwell_cutoff(vp, tol=1e-15):
+    x = np.sqrt(-np.log(tol))
+    for _ in range(8):
+        x = np.sqrt(np.log((2 * x + 1 / x) / (np.sqrt(np.pi) * tol)))
+    return max(x, 1.0) * vp
+
+# 考虑尾部的区间积分: 积分区域截断到 maxwell_cutoff 以内, 截断部分由 maxwell_tail_bound 给出上界;
+# 区间整体位于截断点之外时不做任何函数求值, 因此宽而稀疏的区间与窄区间代价相同。
+# 返回 (概率, 被舍弃尾部的上界, 函数求值次数)
+def tail_aware_probability(lower, upper, vp, tol=1e-15):
+    cutoff = maxwell_cutoff(vp, tol)
+    if lower >= cutoff:
+        return 0.0, float(min(maxwell_tail_bound(lower, vp), 1.0)), 0
+    tail = float(maxwell_tail_bound(cutoff, vp)) if upper > cutoff else 0.0
+    result, evaluations = romberg_integrate(maxwell_distribution, lower, min(upper, cutoff), args=(vp,),
+                                            tol=tol)
+    return result, tail, evaluations
+
+# 使用考虑尾部的积分计算任务 3
+def percentage_3e4_to_3e8_tail(vp, tol=1e-15):
+    result, tail, _ = tail_aware_probability(3e4, 3e8, vp, tol)
+    return result * 100, tail * 100
+
 # 使用梯形积分法计算任务 1
 def percentage_0_to_vp_trap(vp, n=1000):
-    result = trapezoidal_rule(maxwell_distribution, 0, vp, n)
+    result = trapezoidal_rule(maxwell_distribution, 0, vp, n, args=(vp,))
     return result * 100
 
-# 比较方法
+# 使用向量化梯形公式计算任务 1
+def percentage_0_to_vp_trap_vec(vp, n=1000):
+    return trapezoid_vectorized(maxwell_distribution, 0, vp, n, args=(vp,)) * 100
+
+# 使用 Simpson 公式计算任务 1 (n 为奇数时自动加一)
+def percentage_0_to_vp_simpson(vp, n=1000):
+    return simpson_vectorized(maxwell_distribution, 0, vp, n + n % 2, args=(vp,)) * 100
+
+# 使用复合 Gauss-Legendre 公式计算任务 1
+def percentage_0_to_vp_gauss(vp, n=1000):
+    return gauss_legendre(maxwell_distribution, 0, vp, n, args=(vp,)) * 100
+
+# 最概然速率 vp = sqrt(2RT/M), 摩尔质量 M 单位为 kg/mol, 温度 T 单位为 K
+def most_probable_speed(molar_mass, temperature):
+    return np.sqrt(2 * R_GAS * np.asarray(temperature, dtype=float) / np.asarray(molar_mass, dtype=float))
+
+# 用 quad 计算一种气体在各温度、各速率区间内的概率 (供进程池调用)
+def _quad_table_row(vps, bands):
+    return [[quad(maxwell_distribution, a, b, args=(v,))[0] for a, b in bands] for v in vps]
+
+# 批量概率表: 返回形状为 (气体种类数, 温度数, 速率区间数) 的数组, bands 为 [(下限, 上限), ...]。
+# method='analytic' 时用解析 CDF 一次广播完成; method='quad' 时逐行用 quad 计算,
+# 给出 processes 则在进程池中并行
+def probability_table(molar_masses, temperatures, bands, method='analytic', processes=None):
+    bands = np.asarray(bands, dtype=float).reshape(-1, 2)
+    vps = most_probable_speed(np.atleast_1d(molar_masses)[:, None], np.atleast_1d(temperatures)[None, :])
+    if method == 'analytic':
+        return interval_probability(bands[:, 0], bands[:, 1], vps[..., None])
+    if method != 'quad':
+        raise ValueError("method 只能为 'analytic' 或 'quad'")
+    band_list = [tuple(band) for band in bands]
+    if processes is None:
+        rows = [_quad_table_row(row, band_list) for row in vps]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            rows = list(pool.map(_quad_table_row, vps, [band_list] * len(vps)))
+    return np.array(rows, dtype=float)
+
+# 将概率表以 float32 压缩保存为 .npz 文件, 连同气体摩尔质量、温度与速率区间
+def save_probability_table(path, table, molar_masses, temperatures, bands):
+    np.savez_compressed(path, table=np.asarray(table, dtype=np.float32),
+                        molar_masses=np.asarray(molar_masses, dtype=float),
+                        temperatures=np.asarray(temperatures, dtype=float),
+                        bands=np.asarray(bands, dtype=float))
+
+# 读取 save_probability_table 保存的文件, 返回字典
+def load_probability_table(path):
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+# 分块抽样麦克斯韦速率: (v/vp)^2 服从形状参数 3/2 的 Gamma 分布 (即自由度 3 的 chi 分布),
+# 每次产出不超过 block_size 个样本, 共 total 个; total 可以写成 1e8 这样的整数值浮点数
+def sample_maxwell_speeds(vp, total, block_size=1 << 20, seed=None):
+    if total != int(total) or total < 0:
+        raise ValueError(f"样本数 total 必须为非负整数, 当前为 {total}")
+    total = int(total)
+    rng = np.random.default_rng(seed)
+    for start in range(0, total, block_size):
+        count = min(block_size, total - start)
+        yield vp * np.sqrt(rng.standard_gamma(1.5, count))
+
+# 流式直方图: 边抽样边累加计数, 不保存样本; 返回 (计数, 区间边界)
+def maxwell_histogram(vp, total, bins=100, v_max=None, block_size=1 << 20, seed=None):
+    edges = np.linspace(0, 4 * vp if v_max is None else v_max, bins + 1)
+    counts = np.zeros(bins, dtype=np.int64)
+    for block in sample_maxwell_speeds(vp, total, block_size, seed):
+        counts += np.histogram(block, bins=edges)[0]
+    return counts, edges
+
+# 检验直方图是否收敛到解析分布: 返回各区间频率与解析概率 (限定在直方图范围内归一化) 的最大偏差,
+# 以及卡方统计量除以自由度
+def histogram_deviation(counts, edges, vp):
+    total = counts.sum()
+    expected = interval_probability(edges[:-1], edges[1:], vp)
+    expected = expected / expected.sum()
+    observed = counts / total
+    used = expected * total > 5
+    chi2 = np.sum((counts[used] - total * expected[used])**2 / (total * expected[used]))
+    return np.max(np.abs(observed - expected)), chi2 / max(used.sum() - 1, 1)
+
+# 无量纲 CDF 查找表 (自变量 x = v / vp), 首次使用时构建
+_cdf_table = None
+
+# 构建 CDF 查找表: 在 [0, x_max] 上取 num_nodes 个等距节点, 用单调三次 (PCHIP) 插值;
+# error_bound 为每个子区间内取 16 个点与解析 CDF 比较得到的最大误差, 再加上 x_max 之外的尾部概率。
+# 给出 cache_path 时优先从该 .npz 文件 (缺少后缀时自动补上) 读取, 文件不存在或其 num_nodes、x_max
+# 与参数不一致时重新构建并写入
+def build_cdf_table(num_nodes=16385, x_max=8.0, cache_path=None):
+    if cache_path is not None:
+        cache_path = os.fspath(cache_path)
+        if not cache_path.endswith('.npz'):
+            cache_path += '.npz'
+        if os.path.exists(cache_path):
+            with np.load(cache_path) as data:
+                table = {key: data[key] for key in data.files}
+            if table.get('num_nodes') == num_nodes and table.get('x_max') == x_max:
+                return table
+    x = np.linspace(0, x_max, num_nodes)
+    coeffs = PchipInterpolator(x, maxwell_cdf(x, 1.0)).c
+    check = np.linspace(0, x_max, 16 * (num_nodes - 1) + 1)
+    table = {'num_nodes': np.int64(num_nodes), 'x_max': np.float64(x_max), 'step': np.float64(x[1]),
+             'coeffs': np.ascontiguousarray(coeffs.T)}
+    error = np.max(np.abs(_table_cdf(table, check) - maxwell_cdf(check, 1.0)))
+    table['error_bound'] = np.float64(error + maxwell_sf(x_max, 1.0))
+    if cache_path is not None:
+        np.savez(cache_path, **table)
+    return table
+
+# 在查找表上计算 CDF, x 为任意形状的无量纲速率数组
+def _table_cdf(table, x):
+    x = np.asarray(x, dtype=float)
+    coeffs = table['coeffs']
+    idx = np.clip((x / table['step']).astype(np.int64), 0, len(coeffs) - 1)
+    dx = x - idx * table['step']
+    c = coeffs[idx]
+    value = ((c[..., 0] * dx + c[..., 1]) * dx + c[..., 2]) * dx + c[..., 3]
+    return np.where(x <= 0, 0.0, np.where(x >= table['x_max'], 1.0, value))
+
+# 返回当前使用的查找表, 必要时构建 (或从 cache_path 读取)
+def get_cdf_table(cache_path=None):
+    global _cdf_table
+    if _cdf_table is None:
+        _cdf_table = build_cdf_table(cache_path=cache_path)
+        _cdf_table['coeff_list'] = _cdf_table['coeffs'].tolist()
+        _cdf_table['scalar_params'] = (float(_cdf_table['step']), float(_cdf_table['x_max']))
+    return _cdf_table
+
+# 查表计算 [lower, upper] 内的概率, 误差不超过 2 * get_cdf_table()['error_bound'];
+# 标量输入走纯 Python 路径, 单次查询约数微秒
+def lookup_interval_probability(lower, upper, vp):
+    table = get_cdf_table()
+    if all(isinstance(a, (int, float)) for a in (lower, upper, vp)):
+        return _scalar_table_cdf(table, upper / vp) - _scalar_table_cdf(table, lower / vp)
+    return _table_cdf(table, np.asarray(upper) / vp) - _table_cdf(table, np.asarray(lower) / vp)
+
+def _scalar_table_cdf(table, x):
+    step, x_max = table['scalar_params']
+    if x <= 0:
+        return 0.0
+    if x >= x_max:
+        return 1.0
+    idx = min(math.floor(x / step), len(table['coeff_list']) - 1)
+    dx = x - idx * step
+    c0, c1, c2, c3 = table['coeff_list'][idx]
+    return ((c0 * dx + c1) * dx + c2) * dx + c3
+
+# d 维麦克斯韦-玻尔兹曼速率分布族: f_d(v) = 2 / Gamma(d/2) * v^(d-1) / vs^d * exp(-v^2 / vs^2),
+# 其中 vs = sqrt(2kT/m) (三维时即 vp)。d=1 为单个速度分量的绝对值 (半正态), d=2 为 Rayleigh 分布。
+# v_scale 与 weights 可为数组, 表示各组分的 vs 与权重 (自动归一化), 结果为各组分的加权和;
+# v 的每个元素与所有组分在一次广播中计算
+def _mixture(v_scale, weights):
+    v_scale = np.atleast_1d(np.asarray(v_scale, dtype=float))
+    weights = np.ones_like(v_scale) if weights is None else np.broadcast_to(
+        np.asarray(weights, dtype=float), v_scale.shape)
+    return v_scale, weights / weights.sum()
+
+def speed_distribution(v, v_scale, dim=3, weights=None):
+    v_scale, weights = _mixture(v_scale, weights)
+    x = np.asarray(v, dtype=float)[..., None] / v_scale
+    density = (2 / gamma(dim / 2)) * x**(dim - 1) * np.exp(-x**2) / v_scale
+    return density @ weights
+
+# 累积分布函数: 正则化下不完全 Gamma 函数 P(d/2, (v/vs)^2)
+def speed_cdf(v, v_scale, dim=3, weights=None):
+    v_scale, weights = _mixture(v_scale, weights)
+    x = np.asarray(v, dtype=float)[..., None] / v_scale
+    return gammainc(dim / 2, x**2) @ weights
+
+# 平均速率、方均根速率与最概然速率。单组分时 <v^k> = vs^k * Gamma((d+k)/2) / Gamma(d/2) 均为解析式;
+# 混合分布的平均值与方均值按权重相加, 最概然速率在各组分最概然速率之间数值求极大值
+def speed_moments(v_scale, dim=3, weights=None):
+    v_scale, weights = _mixture(v_scale, weights)
+    mean = weights @ (v_scale * gamma((dim + 1) / 2) / gamma(dim / 2))
+    rms = np.sqrt(weights @ (v_scale**2 * dim / 2))
+    modes = v_scale * np.sqrt(max(dim - 1, 0) / 2)
+    if v_scale.size == 1 or dim == 1:
+        most_probable = modes.max() if dim > 1 else 0.0
+    else:
+        grid = np.linspace(modes.min(), modes.max(), 513)
+        k = np.argmax(speed_distribution(grid, v_scale, dim, weights))
+        lo, hi = grid[max(k - 1, 0)], grid[min(k + 1, grid.size - 1)]
+        best = minimize_scalar(lambda u: -speed_distribution(u, v_scale, dim, weights), bounds=(lo, hi),
+                               method='bounded', options={'xatol': 1e-10 * hi})
+        most_probable = best.x if -best.fun >= speed_distribution(grid[k], v_scale, dim, weights) else grid[k]
+    return {'mean': float(mean), 'rms': float(rms), 'most_probable': float(most_probable)}
+
+# 计时: 先预热 warmup 次, 再用 perf_counter_ns 重复计时 repeat 次, 返回中位数与四分位距等统计量 (秒)
+def time_call(func, *args, warmup=3, repeat=21):
+    for _ in range(warmup):
+        func(*args)
+    samples = np.empty(repeat)
+    for k in range(repeat):
+        start = time.perf_counter_ns()
+        func(*args)
+        samples[k] = time.perf_counter_ns() - start
+    samples *= 1e-9
+    q1, median, q3 = np.percentile(samples, [25, 50, 75])
+    return {'median': float(median), 'iqr': float(q3 - q1), 'min': float(samples.min()),
+            'max': float(samples.max()), 'repeat': repeat}
+
+# 拟合收敛阶: 对 log(误差) 与 log(n) 做线性拟合, 误差 ~ C * n^(-order);
+# 误差已达舍入水平 (相对 1e-13 以下) 的点不参与拟合
+def fit_convergence_order(n_list, errors, reference=1.0):
+    n_list = np.asarray(n_list, dtype=float)
+    errors = np.asarray(errors, dtype=float)
+    usable = errors > 1e-13 * abs(reference)
+    if usable.sum() < 2:
+        return None
+    slope, _ = np.polyfit(np.log(n_list[usable]), np.log(errors[usable]), 1)
+    return float(-slope)
+
+# 积分方法基准测试: methods 为 {方法名: f(vp, n)}, 以 exact 为参考值记录每个 n 的误差和耗时,
+# 并拟合收敛阶; 给出 json_path 时把结果写成 JSON 文件
+def benchmark_integrators(methods, vp, exact, n_list=(10, 20, 40, 80, 160, 320, 640, 1280),
+                          warmup=3, repeat=21, json_path=None):
+    n_list = [int(n) for n in n_list]
+    report = {'vp': float(vp), 'exact': float(exact), 'n_list': n_list, 'methods': {}}
+    for name, method in methods.items():
+        runs = []
+        for n in n_list:
+            value = float(method(vp, n))
+            runs.append({'n': n, 'value': value, 'abs_error': abs(value - float(exact)),
+                         'time': time_call(method, vp, n, warmup=warmup, repeat=repeat)})
+        order = fit_convergence_order(n_list, [run['abs_error'] for run in runs], exact)
+        report['methods'][name] = {'runs': runs, 'convergence_order': order}
+    if json_path is not None:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+# 比较方法, trap_function 可以是单个函数, 也可以是 {方法名: 函数} 字典; 耗时为 time_call 的中位数
 def compare_methods(task_name, quad_function, trap_function, vp, n_list=[10, 100, 1000]):
     print(f"\n{task_name} 的方法对比:")
     # 使用 quad 计算（作为参考值）
-    start = time.time()
     quad_res = quad_function(vp)
-    quad_time = time.time() - start
+    quad_time = time_call(quad_function, vp)['median']
     print(f"quad 方法: {quad_res:.6f}%, 耗时: {quad_time:.6f} 秒")
-    # 使用不同区间划分数的梯形法则
-    print("\n梯形积分法结果:")
-    print(f"{'区间划分数':<12}{'结果 (%)':<15}{'相对误差 (%)':<15}{'计算时间 (秒)':<15}")
-    for n in n_list:
-        start = time.time()
-        trap_res = trap_function(vp, n)
-        trap_time = time.time() - start
-        rel_error = abs(trap_res - quad_res) / quad_res * 100
-        print(f"{n:<12}{trap_res:<15.6f}{rel_error:<15.6f}{trap_time:<15.6f}")
+    methods = trap_function if isinstance(trap_function, dict) else {"梯形积分法": trap_function}
+    # 使用不同区间划分数的各积分方法
+    for name, method in methods.items():
+        print(f"\n{name}结果:")
+        print(f"{'区间划分数':<12}{'结果 (%)':<15}{'相对误差 (%)':<15}{'计算时间 (秒)':<15}")
+        for n in n_list:
+            trap_res = method(vp, n)
+            trap_time = time_call(method, vp, n)['median']
+            rel_error = abs(trap_res - quad_res) / quad_res * 100
+            print(f"{n:<12}{trap_res:<15.6f}{rel_error:<15.6f}{trap_time:<15.6f}")
 
 if __name__ == "__main__":
     print("=== 使用 quad 方法的结果 ===")
     print("0 到 vp 间概率百分比:", percentage_0_to_vp(vp), "%")
     print("0 到 3.3vp 间概率百分比:", percentage_0_to_3_3vp(vp), "%")
     print("3×10^4 到 3×10^8 间概率百分比:", percentage_3e4_to_3e8(vp), "%")
+    tail_res, tail_bound = percentage_3e4_to_3e8_tail(vp)
+    print(f"3×10^4 到 3×10^8 间概率百分比 (尾部截断): {tail_res} %, 舍弃部分上界: {tail_bound:.3e} %")
     print("\n=== quad 方法与梯形积分法对比 ===")
-    compare_methods("任务 1: 0 到 vp", percentage_0_to_vp, percentage_0_to_vp_trap, vp)
+    compare_methods("任务 1: 0 到 vp", percentage_0_to_vp, {
+        "梯形积分法": percentage_0_to_vp_trap,
+        "向量化梯形积分法": percentage_0_to_vp_trap_vec,
+        "Simpson 积分法": percentage_0_to_vp_simpson,
+        "Gauss-Legendre 积分法": percentage_0_to_vp_gauss,
+    }, vp)
+    romberg_res, romberg_evals = percentage_0_to_vp_romberg(vp)
+    print(f"\nRomberg 积分法: {romberg_res:.6f}%, 函数求值次数: {romberg_evals}")
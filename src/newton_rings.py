@@ -1,5 +1,14 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.image import AxesImage
+
+try:
+    from src.cache_utils import ArrayCache
+except ImportError:  # 以脚本方式运行时 src 目录本身位于 sys.path 中
+    from cache_utils import ArrayCache
 
 
 def setup_parameters():
@@ -10,10 +19,15 @@ def setup_parameters():
     return lambda_light, R_lens
 
 
-def generate_grid():
-    # 生成 x 和 y 方向的坐标，调整范围至 -0.001 到 0.001，增加点数以提高分辨率
-    x = np.linspace(-0.001, 0.001, 1000)
-    y = np.linspace(-0.001, 0.001, 1000)
+def generate_grid(open_grid=False, dtype=np.float64, half_width=0.001, num_points=1000):
+    # 生成 x 和 y 方向的坐标，范围为 -half_width 到 half_width，每个方向 num_points 个点
+    x = np.linspace(-half_width, half_width, num_points, dtype=dtype)
+    y = np.linspace(-half_width, half_width, num_points, dtype=dtype)
+    if open_grid:
+        # 开放网格: X 形状为 (1, n), Y 形状为 (n, 1), 可广播但不占用稠密数组内存
+        # r^2 由 radial_distance_squared 按需计算, 因此第三个返回值为 None
+        X, Y = np.meshgrid(x, y, sparse=True)
+        return X, Y, None
     # 生成网格坐标
     X, Y = np.meshgrid(x, y)
     # 计算径向距离
@@ -21,6 +35,68 @@ def generate_grid():
     return X, Y, r
 
 
+def radial_distance_squared(X, Y):
+    # 由 (开放) 网格按需计算 r^2, 结果与 X、Y 的精度相同
+    return X * X + Y * Y
+
+
+def film_thickness(r2, R_lens):
+    # 空气膜厚度 d = R - sqrt(R^2 - r^2) 的无相消形式 d = r^2 / (R + sqrt(R^2 - r^2)),
+    # 在 float32 下也能保持相对精度; 标量输入返回标量
+    r2 = np.asarray(r2)
+    if r2.dtype.kind != 'f':
+        r2 = r2.astype(float)
+    R = r2.dtype.type(R_lens)
+    d = np.asarray(R * R - r2)
+    np.sqrt(d, out=d)
+    d += R
+    np.divide(r2, d, out=d)
+    return d if d.ndim else d[()]
+
+
+def calculate_intensity_open(X, Y, lambda_light, R_lens):
+    # 开放网格版本的强度计算: 只生成一个 r^2 稠密数组, 其余运算原地进行, 精度跟随 X、Y 的 dtype
+    d = film_thickness(radial_distance_squared(X, Y), R_lens)
+    d *= d.dtype.type(2 * np.pi / lambda_light)
+    np.sin(d, out=d)
+    d *= d
+    d *= 4
+    return d
+
+
+# 网格几何 (r^2、膜厚等) 缓存
+grid_cache = ArrayCache(max_bytes=256 * 1024 * 1024)
+
+
+def cached_radius_squared(half_width=0.001, num_points=1000, dtype=np.float64):
+    # 带缓存的稠密 r^2 数组 (只读), 以网格范围、分辨率和精度为键
+    key = ('r2', float(half_width), int(num_points), np.dtype(dtype).str)
+    return grid_cache.get(key, lambda: radial_distance_squared(
+        *generate_grid(open_grid=True, dtype=dtype, half_width=half_width, num_points=num_points)[:2]))
+
+
+def cached_film_thickness(R_lens, half_width=0.001, num_points=1000, dtype=np.float64):
+    # 带缓存的膜厚分布 (只读); 膜厚只与 R_lens 和网格有关, 扫描波长时可直接复用
+    key = ('d', float(R_lens), float(half_width), int(num_points), np.dtype(dtype).str)
+    return grid_cache.get(key, lambda: film_thickness(cached_radius_squared(half_width, num_points, dtype), R_lens))
+
+
+def sweep_newton_rings(parameters, half_width=0.001, num_points=1000, dtype=np.float64, profiles_only=False):
+    # 参数扫描: parameters 为 [(lambda_light, R_lens), ...], 复用缓存的 r^2 和膜厚
+    # 返回形状为 (参数个数, num_points, num_points) 的强度图堆栈;
+    # profiles_only=True 时只返回沿半径 0 到 sqrt(2) * half_width 的一维剖面 (半径数组, 剖面堆栈)
+    if profiles_only:
+        radii = np.linspace(0, np.sqrt(2) * half_width, num_points)
+        return radii, np.stack([calculate_intensity(radii, lam, R) for lam, R in parameters])
+    stack = np.empty((len(parameters), num_points, num_points), dtype=dtype)
+    for out, (lam, R) in zip(stack, parameters):
+        np.multiply(cached_film_thickness(R, half_width, num_points, dtype), np.dtype(dtype).type(2 * np.pi / lam), out=out)
+        np.sin(out, out=out)
+        out *= out
+        out *= 4
+    return stack
+
+
 def calculate_intensity(r, lambda_light, R_lens):
     # 计算空气膜厚度
     d = R_lens - np.sqrt(R_lens**2 - r**2)
@@ -29,10 +105,366 @@ def calculate_intensity(r, lambda_light, R_lens):
     return intensity
 
 
-def plot_newton_rings(intensity):
+def radial_sample_grid(r2_max, lambda_light, R_lens, tol=1e-3, method='linear', max_samples=10**7):
+    # 一维剖面所用的 s = r^2 等距网格, 返回 (网格步长, 网格)
+    # I(s) = 2 * (1 - cos(phi)), phi = 4 * pi * d / lambda, 故 |I'| <= 2 * phi', |I''| <= 2 * phi'^2 + 2 * |phi''|
+    # 线性插值误差不超过 h^2 / 8 * max|I''|, 最近邻查表误差不超过 h / 2 * max|I'|, 据此由 tol 确定步长 h
+    root = np.sqrt(R_lens**2 - r2_max)
+    dphi = 4 * np.pi / lambda_light / (2 * root)
+    d2phi = 4 * np.pi / lambda_light / (4 * root**3)
+    if method == 'linear':
+        step = np.sqrt(8 * tol / (2 * dphi**2 + 2 * d2phi))
+    elif method == 'nearest':
+        step = tol / dphi
+    else:
+        raise ValueError("method 只能为 'linear' 或 'nearest'")
+    num_samples = int(np.ceil(r2_max / step)) + 2
+    if num_samples > max_samples:
+        raise ValueError(f"容差 tol={tol} 需要 {num_samples} 个剖面采样点, 超过上限 {max_samples}")
+    return step, np.arange(num_samples) * step
+
+
+def radial_intensity_profile(r2_max, lambda_light, R_lens, tol=1e-3, method='linear', max_samples=10**7):
+    # 在 s = r^2 的等距网格上计算一维强度剖面, 返回 (网格步长, 剖面)
+    step, s = radial_sample_grid(r2_max, lambda_light, R_lens, tol, method, max_samples)
+    profile = calculate_intensity(np.sqrt(np.minimum(s, R_lens**2)), lambda_light, R_lens)
+    return step, profile
+
+
+def lookup_radial_profile(r2, step, profile, method='linear'):
+    # 按 r^2 在一维剖面上查表; profile 可带额外的通道维 (如 RGB), 结果形状为 r2.shape + profile.shape[1:]
+    # 单通道线性插值直接用 np.interp 更快, 这里的 take 查表用于最近邻和多通道剖面
+    if method == 'nearest':
+        return profile.take((r2 * (1 / step) + 0.5).astype(np.intp), axis=0)
+    pos = r2 * (1 / step)
+    idx = pos.astype(np.intp)
+    pos -= idx
+    pos = pos.reshape(pos.shape + (1,) * (profile.ndim - 1))
+    lower = profile.take(idx, axis=0)
+    idx += 1
+    values = profile.take(idx, axis=0)
+    values -= lower
+    values *= pos
+    values += lower
+    return values
+
+
+def calculate_intensity_fast(r, lambda_light, R_lens, tol=1e-3, squared=False, method='linear'):
+    # 利用图样的径向对称性: 先计算一维剖面, 再按 r^2 查表映射到二维, 不对每个像素求 sqrt 和 sin
+    # squared=True 表示传入的已经是 r^2; 与 calculate_intensity 的最大偏差不超过 tol
+    # method='nearest' 只做一次查表, 剖面更密但速度更快
+    r2 = np.asarray(r) if squared else np.square(r)
+    step, profile = radial_intensity_profile(float(r2.max()), lambda_light, R_lens, tol, method)
+    if method == 'linear':
+        return np.interp(r2, step * np.arange(profile.size), profile)
+    return lookup_radial_profile(r2, step, profile, method)
+
+
+def calculate_intensity_fast_grid(lambda_light, R_lens, half_width=0.001, num_points=1000, tol=1e-3,
+                                  method='linear'):
+    # 在 generate_grid 同样的网格上做径向查表, 直接使用缓存的 r^2,
+    # 省去稠密 r 所需的 sqrt 以及 calculate_intensity_fast 中的再次平方
+    r2 = cached_radius_squared(half_width, num_points)
+    return calculate_intensity_fast(r2, lambda_light, R_lens, tol, squared=True, method=method)
+
+
+def benchmark_intensity(num_points=2000, repeat=3):
+    # 比较精确公式与径向查表的耗时 (秒, 取 repeat 次中的最小值), 返回 {方法名: 耗时}
+    # 'exact' 和 'fast (r)' 以稠密 r 为输入, 'fast (r^2)' 以缓存的 r^2 为输入; 网格生成不计入耗时
+    lambda_light, R_lens = setup_parameters()
+    r = generate_grid(num_points=num_points)[2]
+    r2 = cached_radius_squared(num_points=num_points)
+    methods = {
+        'exact': lambda: calculate_intensity(r, lambda_light, R_lens),
+        'fast (r)': lambda: calculate_intensity_fast(r, lambda_light, R_lens),
+        'fast (r^2)': lambda: calculate_intensity_fast(r2, lambda_light, R_lens, squared=True),
+    }
+    results = {}
+    for name, method in methods.items():
+        best = np.inf
+        for _ in range(repeat):
+            start = time.perf_counter()
+            method()
+            best = min(best, time.perf_counter() - start)
+        results[name] = best
+    return results
+
+
+def _piecewise_gaussian(wavelength_nm, mu, sigma_left, sigma_right):
+    sigma = np.where(wavelength_nm < mu, sigma_left, sigma_right)
+    return np.exp(-0.5 * ((wavelength_nm - mu) / sigma)**2)
+
+
+def wavelength_to_rgb(wavelengths):
+    # 波长 (m) 对应的线性 sRGB 三刺激值, 形状 (n, 3)
+    # CIE 1931 色匹配函数采用 Wyman, Sloan, Shirley (2013) 的多段高斯拟合, 再由 XYZ 转换到线性 sRGB
+    nm = np.asarray(wavelengths, dtype=float) * 1e9
+    xyz = np.stack([
+        1.056 * _piecewise_gaussian(nm, 599.8, 37.9, 31.0) + 0.362 * _piecewise_gaussian(nm, 442.0, 16.0, 26.7)
+        - 0.065 * _piecewise_gaussian(nm, 501.1, 20.4, 26.2),
+        0.821 * _piecewise_gaussian(nm, 568.8, 46.9, 40.5) + 0.286 * _piecewise_gaussian(nm, 530.9, 16.3, 31.1),
+        1.217 * _piecewise_gaussian(nm, 437.0, 11.8, 36.0) + 0.681 * _piecewise_gaussian(nm, 459.0, 26.0, 13.8),
+    ], axis=-1)
+    xyz_to_rgb = np.array([[3.2406, -1.5372, -0.4986],
+                           [-0.9689, 1.8758, 0.0415],
+                           [0.0557, -0.2040, 1.0570]])
+    return xyz @ xyz_to_rgb.T
+
+
+def blackbody_spectrum(wavelengths, temperature=5500):
+    # 黑体辐射光谱 (普朗克公式, 归一化到最大值为 1), 可作为白光光源的权重
+    h, c, k = 6.62607015e-34, 2.99792458e8, 1.380649e-23
+    wavelengths = np.asarray(wavelengths, dtype=float)
+    radiance = 1 / (wavelengths**5 * np.expm1(h * c / (wavelengths * k * temperature)))
+    return radiance / radiance.max()
+
+
+def _spectral_weights(wavelengths, weights):
+    # 每个波长对 RGB 三个通道的权重; 三个通道除以同一个标量以保留光源的色度,
+    # 使非相干极限 (强度平均值 2) 下最亮的通道为 1
+    channel = np.asarray(weights, dtype=float)[:, None] * wavelength_to_rgb(wavelengths)
+    return channel / (2 * channel.sum(axis=0).max())
+
+
+def calculate_intensity_spectral(r, wavelengths, weights, R_lens, chunk_size=64, tol=1e-3, squared=False,
+                                 radial=True, cache_bytes=32 * 1024 * 1024):
+    # 多色光 (白光、LED 等) 牛顿环: 按光谱权重对各波长的强度求和并映射为 RGB, 返回形状 r.shape + (3,)
+    # 膜厚 d 只计算一次, 波长按 chunk_size 分批, 采样点按 cache_bytes 分块, 每块与一批波长组成
+    # (批大小 x 块长) 的矩阵后乘以 RGB 权重累加, 临时数组大小不超过 cache_bytes
+    # radial=True 时在一维 r^2 剖面上完成全部波长的求和, 二维映射只做一次查表, 总耗时几乎与波长数无关;
+    # radial=False 时直接在二维 d 上逐块累加
+    wavelengths = np.asarray(wavelengths, dtype=float)
+    rgb_weights = _spectral_weights(wavelengths, weights)
+    wavenumbers = 2 * np.pi / wavelengths
+    r2 = np.asarray(r) if squared else np.square(r)
+    if radial:
+        step, s = radial_sample_grid(float(r2.max()), wavelengths.min(), R_lens, tol)
+        d = film_thickness(np.minimum(s, R_lens**2), R_lens)
+    else:
+        d = film_thickness(r2, R_lens)
+    rgb = np.zeros(d.shape + (3,))
+    flat_d = d.reshape(-1)
+    flat_rgb = rgb.reshape(-1, 3)
+    chunk_size = min(chunk_size, wavelengths.size)
+    block = max(1, cache_bytes // (8 * chunk_size))
+    buffer = np.empty((chunk_size, min(block, flat_d.size)))
+    for lo in range(0, flat_d.size, block):
+        hi = min(lo + block, flat_d.size)
+        for start in range(0, wavelengths.size, chunk_size):
+            stop = min(start + chunk_size, wavelengths.size)
+            intensity = np.multiply.outer(wavenumbers[start:stop], flat_d[lo:hi],
+                                          out=buffer[:stop - start, :hi - lo])
+            np.sin(intensity, out=intensity)
+            np.square(intensity, out=intensity)
+            flat_rgb[lo:hi] += 4 * (rgb_weights[start:stop].T @ intensity).T
+    if radial:
+        rgb = lookup_radial_profile(r2, step, rgb)
+    # 超出 sRGB 色域的分量 (线性 RGB 为负) 截断为 0
+    return np.maximum(rgb, 0, out=rgb)
+
+
+def render_newton_rings_tiled(path, size, lambda_light, R_lens, half_width=0.001, tile_size=1024,
+                              region=None, workers=None, dtype=np.float32):
+    # 分块渲染 size x size 的牛顿环图像到内存映射的 .npy 文件, 图像可远大于内存
+    # 像素 (i, j) 对应坐标 y_i, x_j = -half_width + (i, j) * 2 * half_width / (size - 1)
+    # region=(row_start, row_stop, col_start, col_stop) 时只以全分辨率渲染该子区域
+    # 各块在线程池中并行计算 (NumPy ufunc 运算时释放 GIL), 返回 (内存映射数组, 统计信息)
+    row_start, row_stop, col_start, col_stop = (0, size, 0, size) if region is None else region
+    pixel = 2 * half_width / (size - 1)
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=dtype,
+                                    shape=(row_stop - row_start, col_stop - col_start))
+    tiles = [(r0, min(r0 + tile_size, row_stop), c0, min(c0 + tile_size, col_stop))
+             for r0 in range(row_start, row_stop, tile_size)
+             for c0 in range(col_start, col_stop, tile_size)]
+
+    def render_tile(bounds):
+        r0, r1, c0, c1 = bounds
+        X = (-half_width + np.arange(c0, c1) * pixel).astype(dtype)[None, :]
+        Y = (-half_width + np.arange(r0, r1) * pixel).astype(dtype)[:, None]
+        out[r0 - row_start:r1 - row_start, c0 - col_start:c1 - col_start] = \
+            calculate_intensity_open(X, Y, lambda_light, R_lens)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(render_tile, tiles))
+    out.flush()
+    elapsed = time.perf_counter() - start
+    return out, {'tiles': len(tiles), 'seconds': elapsed, 'tiles_per_s': len(tiles) / elapsed}
+
+
+def azimuthal_average(image, pixel_size, center=None, bin_width=1.0):
+    # 方位角平均: 按像素到中心的距离分箱 (箱宽 bin_width 个像素), 用 np.bincount 求每箱平均强度
+    # center 为 (行, 列) 像素坐标, 默认取图像中心; 返回 (各箱中心半径 (m), 平均强度)
+    rows, cols = image.shape
+    cy, cx = ((rows - 1) / 2, (cols - 1) / 2) if center is None else center
+    dy = (np.arange(rows) - cy)[:, None]
+    dx = (np.arange(cols) - cx)[None, :]
+    bins = (np.sqrt(dx * dx + dy * dy) * (1 / bin_width) + 0.5).astype(np.intp).ravel()
+    counts = np.bincount(bins)
+    sums = np.bincount(bins, weights=image.ravel())
+    valid = counts > 0
+    radii = np.arange(counts.size) * bin_width * pixel_size
+    return radii[valid], sums[valid] / counts[valid]
+
+
+def find_dark_rings(radii, profile, max_radius=None):
+    # 在径向剖面中寻找暗环: 将低于平均强度的连续区段视为一个暗纹, 取区段内的最小值,
+    # 再用抛物线插值得到亚箱精度的半径。包含 r=0 的区段是中心暗斑 (k=0), 不计入结果。
+    # max_radius 默认取内切圆半径以内, 避免图像角落处方位角覆盖不完整
+    if max_radius is not None:
+        keep = radii <= max_radius
+        radii, profile = radii[keep], profile[keep]
+    dark = profile < profile.mean()
+    segment = np.cumsum(np.diff(dark.astype(np.int8), prepend=0) == 1)
+    segment[~dark] = 0
+    order = np.lexsort((profile, segment))
+    first = np.r_[True, np.diff(segment[order]) != 0]
+    idx = order[first]
+    idx = idx[segment[idx] >= (2 if dark[0] else 1)]
+    idx = idx[(idx > 0) & (idx < profile.size - 1)]
+    a, b, c = profile[idx - 1], profile[idx], profile[idx + 1]
+    denom = a - 2 * b + c
+    offset = np.where(denom > 0, 0.5 * (a - c) / np.where(denom > 0, denom, 1), 0.0)
+    step = radii[idx + 1] - radii[idx]
+    return radii[idx] + offset * step
+
+
+def fit_ring_radii(ring_radii, lambda_light=None, R_lens=None):
+    # 暗环满足 r_k^2 = k * lambda * R (d = r^2 / 2R = k * lambda / 2), 对 r_k^2 与序号 k 做线性最小二乘拟合
+    # 给出 lambda_light 时反演 R_lens, 给出 R_lens 时反演波长; 截距吸收中心位置与序号偏移的误差
+    orders = np.arange(1, len(ring_radii) + 1)
+    (slope, intercept), residuals, *_ = np.polyfit(orders, np.square(ring_radii), 1, full=True)
+    result = {'slope': slope, 'intercept': intercept, 'orders': orders, 'radii': np.asarray(ring_radii),
+              'rms_residual': np.sqrt(residuals[0] / len(orders)) if residuals.size else 0.0}
+    if lambda_light is not None:
+        result['R_lens'] = slope / lambda_light
+    if R_lens is not None:
+        result['lambda_light'] = slope / R_lens
+    return result
+
+
+def analyze_rings(image, pixel_size, lambda_light=None, R_lens=None, center=None):
+    # 完整的反演流程: 方位角平均 -> 暗环定位 -> 线性拟合
+    radii, profile = azimuthal_average(image, pixel_size, center)
+    max_radius = (min(image.shape) - 1) / 2 * pixel_size
+    rings = find_dark_rings(radii, profile, max_radius)
+    return fit_ring_radii(rings, lambda_light, R_lens)
+
+
+def analyze_rings_batch(images, pixel_size, lambda_light=None, R_lens=None, processes=None):
+    # 批量反演多幅图像, processes 不为 None 时使用进程池
+    if processes is None:
+        return [analyze_rings(image, pixel_size, lambda_light, R_lens) for image in images]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(analyze_rings, image, pixel_size, lambda_light, R_lens) for image in images]
+        return [future.result() for future in futures]
+
+
+def downsample_area(image, factor=2):
+    # factor x factor 面积平均降采样 (尺寸不是 factor 的整数倍时先复制边缘补齐), 相当于盒式低通滤波, 可避免环纹混叠
+    rows, cols = image.shape[:2]
+    pad_rows, pad_cols = -rows % factor, -cols % factor
+    if pad_rows or pad_cols:
+        pad = ((0, pad_rows), (0, pad_cols)) + ((0, 0),) * (image.ndim - 2)
+        image = np.pad(image, pad, mode='edge')
+    rows, cols = image.shape[:2]
+    return image.reshape((rows // factor, factor, cols // factor, factor) + image.shape[2:]).mean(axis=(1, 3))
+
+
+class ImagePyramid:
+    # 多分辨率图像金字塔: 第 0 级为原图, 第 k 级由原图按 2^k x 2^k 面积平均得到
+    # levels 只保存已完整计算的级别; crop 在级别未计算时只对视野内的原图区域降采样, 不生成整级
+
+    def __init__(self, image, min_size=64):
+        self.levels = {0: np.asarray(image)}
+        self.num_levels = 1
+        size = min(self.levels[0].shape[:2])
+        while size > min_size:
+            size = (size + 1) // 2
+            self.num_levels += 1
+
+    def shape(self, k):
+        rows, cols = self.levels[0].shape[:2]
+        return -(-rows // 2**k), -(-cols // 2**k)
+
+    def level(self, k):
+        if k not in self.levels:
+            self.levels[k] = downsample_area(self.levels[0], 2**k)
+        return self.levels[k]
+
+    def select_level(self, view_fraction, screen_pixels):
+        # 选择在当前视野内像素数仍不少于屏幕像素数的最粗一级
+        full_pixels = np.asarray(self.levels[0].shape[:2][::-1]) * np.asarray(view_fraction)
+        ratio = np.min(full_pixels / np.maximum(np.asarray(screen_pixels), 1))
+        k = int(np.floor(np.log2(ratio))) if ratio >= 1 else 0
+        return int(np.clip(k, 0, self.num_levels - 1))
+
+    def crop(self, k, extent, xlim, ylim):
+        # 取第 k 级中覆盖视野 (xlim, ylim) 的子图, 返回 (子图, 子图的 extent); 图像按 origin='upper' 显示
+        # 第 k 级尚未计算时只降采样原图中对应的区域; 视野覆盖整级时顺便保存该级
+        rows, cols = self.shape(k)
+        left, right, bottom, top = extent
+        dx = (right - left) / cols
+        dy = (top - bottom) / rows
+        c0 = int(np.clip(np.floor((min(xlim) - left) / dx), 0, cols - 1))
+        c1 = int(np.clip(np.ceil((max(xlim) - left) / dx), c0 + 1, cols))
+        r0 = int(np.clip(np.floor((top - max(ylim)) / dy), 0, rows - 1))
+        r1 = int(np.clip(np.ceil((top - min(ylim)) / dy), r0 + 1, rows))
+        if k in self.levels or (r1 - r0, c1 - c0) == (rows, cols):
+            data = self.level(k)[r0:r1, c0:c1]
+        else:
+            factor = 2**k
+            data = downsample_area(self.levels[0][r0 * factor:r1 * factor, c0 * factor:c1 * factor], factor)
+        return data, (left + c0 * dx, left + c1 * dx, top - r1 * dy, top - r0 * dy)
+
+
+class PyramidImage(AxesImage):
+    # 按图像金字塔显示的图像: 每次绘制前视野 (xlim, ylim) 有变化时才重新选择级别并裁剪,
+    # 一次缩放同时改变 x 和 y 范围时也只裁剪一次
+
+    def __init__(self, ax, image, extent, min_size=64, **kwargs):
+        super().__init__(ax, **kwargs)
+        self.pyramid = ImagePyramid(image, min_size=min_size)
+        self.full_extent = extent
+        self._view = None
+        self.set_data(np.zeros((1, 1)))
+        self.set_extent(extent)
+
+    def update_view(self):
+        ax = self.axes
+        view = (tuple(ax.get_xlim()), tuple(ax.get_ylim()))
+        if view == self._view:
+            return
+        self._view = view
+        xlim, ylim = view
+        left, right, bottom, top = self.full_extent
+        view_fraction = (abs(xlim[1] - xlim[0]) / (right - left), abs(ylim[1] - ylim[0]) / (top - bottom))
+        bbox = ax.get_window_extent()
+        k = self.pyramid.select_level(view_fraction, (bbox.width, bbox.height))
+        data, data_extent = self.pyramid.crop(k, self.full_extent, xlim, ylim)
+        self.set_data(data)
+        self.set_extent(data_extent)
+
+    def draw(self, renderer):
+        self.update_view()
+        super().draw(renderer)
+
+
+def plot_newton_rings(intensity, extent=(-0.001, 0.001, -0.001, 0.001), level_of_detail=False):
     plt.figure(figsize=(10, 10))
     # 绘制图像，调整对比度，更新绘图范围
-    plt.imshow(intensity, cmap='gray', extent=(-0.001, 0.001, -0.001, 0.001), vmin=0, vmax=1)
+    if level_of_detail:
+        # 多分辨率显示: 只绘制视野内、分辨率与屏幕相当的金字塔子图, 缩放平移后在下次绘制时重新选择级别并裁剪
+        ax = plt.gca()
+        # 固定视野, 替换子图时不改变当前范围
+        ax.set_xlim(extent[0], extent[1])
+        ax.set_ylim(extent[2], extent[3])
+        ax.set_aspect('equal')
+        image = PyramidImage(ax, intensity, extent, cmap='gray', norm=plt.Normalize(0, 1))
+        ax.add_image(image)
+        plt.sci(image)
+    else:
+        plt.imshow(intensity, cmap='gray', extent=extent, vmin=0, vmax=1)
     # 添加颜色条
     plt.colorbar(label='Intensity')
     # 设置标题
@@ -54,3 +486,6 @@ if __name__ == "__main__":
     intensity = calculate_intensity(r, lambda_light, R_lens)
     # 绘制牛顿环
     plot_newton_rings(intensity)
+    # 精确公式与径向查表的耗时比较
+    for name, seconds in benchmark_intensity().items():
+        print(f"{name:<12}{seconds * 1e3:.1f} ms")
@@ -3,7 +3,7 @@ from scipy.integrate import odeint
 import matplotlib.pyplot as plt
 
 
-def solve_ode_euler(step_num):
+def solve_ode_euler(step_num, k=1.0, m=1.0, damping=0.0):
     # 创建存储位置和速度的数组，长度为 step_num + 1
     position = np.zeros(step_num + 1)
     velocity = np.zeros(step_num + 1)
@@ -19,8 +19,8 @@ def solve_ode_euler(step_num):
     for i in range(step_num):
         # 根据微分方程更新位置
         position[i + 1] = position[i] + velocity[i] * time_step
-        # 根据微分方程更新速度，这里假设 k = m = 1
-        velocity[i + 1] = velocity[i] - position[i] * time_step
+        # 根据微分方程更新速度: m x'' = -k x - damping x'
+        velocity[i + 1] = velocity[i] - (k * position[i] + damping * velocity[i]) / m * time_step
 
     # 生成时间数组
     time_points = np.arange(step_num + 1) * time_step
@@ -28,6 +28,31 @@ def solve_ode_euler(step_num):
     return time_points, position, velocity
 
 
+def euler_propagator(k, m, damping, time_step):
+    # 欧拉法一步的传播矩阵 A: (x, v)_{n+1} = A (x, v)_n
+    return np.array([[1.0, time_step],
+                     [-k / m * time_step, 1.0 - damping / m * time_step]])
+
+
+def solve_ode_euler_propagator(step_num, k=1.0, m=1.0, damping=0.0):
+    # 与 solve_ode_euler 相同的欧拉解, 但不逐步循环: 状态 s_n = A^n s_0,
+    # 利用倍增 s_{j+M} = A^M s_j (M = 1, 2, 4, ...) 每次用一次向量化矩阵乘法填充一段轨迹,
+    # Python 层只循环 log2(step_num) 次; 结果与逐步循环在舍入误差范围内一致
+    time_step = 2 * np.pi / step_num
+    propagator = euler_propagator(k, m, damping, time_step)
+    states = np.empty((step_num + 1, 2))
+    states[0] = (0.0, 1.0)
+    filled = 1
+    power = propagator
+    while filled < step_num + 1:
+        count = min(filled, step_num + 1 - filled)
+        np.matmul(states[:count], power.T, out=states[filled:filled + count])
+        filled += count
+        power = power @ power
+    time_points = np.arange(step_num + 1) * time_step
+    return time_points, states[:, 0].copy(), states[:, 1].copy()
+
+
 def spring_mass_ode_func(state, time):
     position, velocity = state
     d_position_dt = velocity
@@ -2,12 +2,18 @@ import pytest
 import numpy as np
 import sys
 import os
+import wave
+import asyncio
 
 # Add the parent directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 #from solutions.beats_simulation_solution import simulate_beat_frequency, parameter_sensitivity_analysis
 from src.beats_simulation import simulate_beat_frequency, parameter_sensitivity_analysis
+from src.beats_simulation import simulate_beat_frequency_stream, superpose_partials, sweep_beat_parameters
+from src.beats_simulation import estimate_beat_frequency, estimate_beat_frequency_stream, decimate_minmax
+from src.beats_simulation import ArrayCache, cached_sine_waves, create_time_array, generate_sine_waves
+from src.beats_simulation import export_beat_signal, BeatProducer
 
 class TestBeatFrequencySimulation:
     """测试拍频模拟功能"""
@@ -41,9 +47,202 @@ class TestBeatFrequencySimulation:
             _, _, beat_freq = simulate_beat_frequency(f1=f1, f2=f2, show_plot=False)
             assert beat_freq == expected
 
+class TestStreaming:
+    """测试分块流式生成"""
+
+    def test_stream_matches_one_shot(self):
+        """分块拼接结果应与一次性计算逐位一致"""
+        t, wave, _ = simulate_beat_frequency(t_start=0.5, t_end=3, num_points=10001, show_plot=False)
+        blocks = list(simulate_beat_frequency_stream(t_start=0.5, t_end=3, num_points=10001, block_size=1000))
+        assert len(blocks) == 11
+        assert all(len(bt) <= 1000 for bt, _ in blocks)
+        assert np.array_equal(np.concatenate([bt for bt, _ in blocks]), t)
+        assert np.array_equal(np.concatenate([bw for _, bw in blocks]), wave)
+
+class TestPartials:
+    """测试多分量叠加引擎"""
+
+    def test_matches_per_tone_sum(self):
+        """与逐分量求和一致, 两分量时退化为原叠加结果"""
+        t, wave, _ = simulate_beat_frequency(num_points=20000, show_plot=False)
+        assert np.allclose(superpose_partials([440, 444], [1.0, 1.0], t, cache_bytes=4096), wave, atol=1e-12)
+
+        freqs = np.linspace(100, 900, 50)
+        amps = np.linspace(1, 0.1, 50)
+        phases = np.linspace(0, 3, 50)
+        expected = sum(a * np.sin(2 * np.pi * f * t + p) for f, a, p in zip(freqs, amps, phases))
+        assert np.allclose(superpose_partials(freqs, amps, t, phases), expected, atol=1e-10)
+        result32 = superpose_partials(freqs, amps, t, phases, dtype=np.float32)
+        assert result32.dtype == np.float32
+        assert np.allclose(result32, expected, atol=1e-4)
+
+    def test_multidimensional_time(self):
+        """二维时间数组按元素计算, 返回相同形状"""
+        t = create_time_array(0, 1, 6000).reshape(3, 2000)
+        result = superpose_partials([440, 444], [1.0, 0.5], t, cache_bytes=4096)
+        assert result.shape == (3, 2000)
+        assert np.allclose(result, np.sin(2 * np.pi * 440 * t) + 0.5 * np.sin(2 * np.pi * 444 * t), atol=1e-12)
+
+class TestBeatEstimation:
+    """测试从信号估计拍频"""
+
+    def test_estimate_from_noisy_signal(self):
+        """含噪声信号的拍频估计应接近 |f1 - f2|"""
+        t, wave, beat_freq = simulate_beat_frequency(f1=440, f2=446, A2=0.5, t_end=2, num_points=20000,
+                                                     show_plot=False)
+        noisy = wave + np.random.default_rng(0).normal(0, 0.2, wave.size)
+        estimate, envelope = estimate_beat_frequency(noisy, t)
+        assert abs(estimate - beat_freq) < 0.05
+        assert envelope.shape == wave.shape
+
+    def test_stream_estimate_converges(self):
+        """流式估计在窗口填满后应收敛到拍频"""
+        blocks = simulate_beat_frequency_stream(f2=443, t_end=4, num_points=40001, block_size=4000)
+        estimates = list(estimate_beat_frequency_stream(blocks, sample_rate=10000, window=20000))
+        assert len(estimates) == 11
+        assert abs(estimates[-1] - 3) < 0.02
+
+    def test_stream_hop_limits_updates(self):
+        """每累计 hop 个新采样点才更新一次估计, 其间的块沿用上一次的结果"""
+        blocks = simulate_beat_frequency_stream(f2=443, t_end=4, num_points=40001, block_size=4000)
+        estimates = list(estimate_beat_frequency_stream(blocks, sample_rate=10000, window=20000, hop=12000))
+        assert estimates[0] == estimates[1] == estimates[2]
+        assert estimates[3] != estimates[2]
+        assert abs(estimates[-1] - 3) < 0.02
+
+    def test_no_beat_returns_nan(self):
+        """纯音、含噪声的纯音和静音都没有拍, 估计值应为 nan"""
+        t = np.arange(20000) / 10000
+        tone = np.sin(2 * np.pi * 440 * t)
+        noisy = tone + np.random.default_rng(0).normal(0, 0.2, t.size)
+        for wave in (tone, np.sin(2 * np.pi * 441.3 * t), noisy, np.zeros_like(t)):
+            assert np.isnan(estimate_beat_frequency(wave, t)[0])
+
+    def test_stream_silence_returns_nan(self):
+        """流式估计对静音块和纯音块都产出 nan"""
+        silence = [np.zeros(4000) for _ in range(3)]
+        assert all(np.isnan(list(estimate_beat_frequency_stream(silence, sample_rate=10000))))
+        tone = np.sin(2 * np.pi * 440 * np.arange(12000) / 10000)
+        blocks = np.split(tone, 3)
+        assert all(np.isnan(list(estimate_beat_frequency_stream(blocks, sample_rate=10000))))
+
+class TestDecimation:
+    """测试 min/max 抽取"""
+
+    def test_decimate_preserves_extrema(self):
+        """抽取后点数有界, 且保留每箱的极值"""
+        t, wave, _ = simulate_beat_frequency(num_points=100003, show_plot=False)
+        td, wd = decimate_minmax(t, wave, 500)
+        assert len(td) <= 2 * 500
+        assert np.all(np.diff(td) >= 0)
+        assert wd.max() == wave.max() and wd.min() == wave.min()
+        edges = np.linspace(0, wave.size, 501).astype(int)
+        assert np.array_equal(np.maximum(wd[0::2], wd[1::2]), np.maximum.reduceat(wave, edges[:-1]))
+        assert np.array_equal(np.minimum(wd[0::2], wd[1::2]), np.minimum.reduceat(wave, edges[:-1]))
+
+    def test_decimate_never_exceeds_bins(self):
+        """箱长不整除时输出点数仍不超过 2 * num_bins"""
+        t = np.arange(1499.0)
+        td, wd = decimate_minmax(t, np.sin(t), 500)
+        assert len(td) == len(wd) == 1000
+
+class TestArrayCache:
+    """测试时间数组与正弦波缓存"""
+
+    def test_lru_budget_and_readonly(self):
+        """超出字节预算时淘汰最久未用的项, 缓存数组不可写"""
+        cache = ArrayCache(max_bytes=2 * 800)
+        a = cache.get('a', lambda: np.zeros(100))
+        cache.get('b', lambda: np.ones(100))
+        assert cache.get('a', lambda: None) is a
+        cache.get('c', lambda: np.ones(100))
+        assert cache.stats() == {'hits': 1, 'misses': 3, 'entries': 2, 'nbytes': 1600, 'max_bytes': 1600}
+        with pytest.raises(ValueError):
+            a[0] = 1.0
+
+    def test_cached_waves_match(self):
+        """缓存结果与直接计算一致"""
+        wave1, wave2 = cached_sine_waves(440, 444, 1.0, 0.5, 0, 1, 5000)
+        expected1, expected2 = generate_sine_waves(440, 444, 1.0, 0.5, create_time_array(0, 1, 5000))
+        assert np.array_equal(wave1, expected1) and np.array_equal(wave2, expected2)
+        assert cached_sine_waves(440, 444, 1.0, 0.5, 0, 1, 5000)[0] is wave1
+
+class TestExport:
+    """测试逐块导出到磁盘"""
+
+    def test_export_npy_and_wav(self, tmp_path):
+        """.npy 与原信号一致, WAV 在量化误差内一致"""
+        _, wave_data, _ = simulate_beat_frequency(num_points=8001, show_plot=False)
+        info = export_beat_signal(tmp_path / 'beat.npy', num_points=8001, block_size=1000)
+        assert info['bytes'] == 8001 * 8
+        assert np.array_equal(np.load(tmp_path / 'beat.npy'), wave_data)
+
+        export_beat_signal(tmp_path / 'beat.wav', num_points=8001, block_size=1000)
+        with wave.open(str(tmp_path / 'beat.wav'), 'rb') as wav:
+            assert wav.getframerate() == 8000 and wav.getsampwidth() == 2
+            pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype='<i2')
+        assert np.allclose(pcm / 32767 * 2.0, wave_data, atol=1e-4)
+
+    def test_export_wav_edge_cases(self, tmp_path):
+        """静音可正常导出, 满幅 32 位 PCM 不回绕, 时长为 0 时要求显式采样率"""
+        export_beat_signal(tmp_path / 'silence.wav', A1=0, A2=0, num_points=8001, block_size=1000)
+        with wave.open(str(tmp_path / 'silence.wav'), 'rb') as wav:
+            assert not np.any(np.frombuffer(wav.readframes(wav.getnframes()), dtype='<i2'))
+
+        export_beat_signal(tmp_path / 'full.wav', f1=2000, f2=2000, num_points=8001, sample_width=4)
+        with wave.open(str(tmp_path / 'full.wav'), 'rb') as wav:
+            pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype='<i4')
+        assert pcm.max() == np.iinfo(np.int32).max and pcm.min() == -np.iinfo(np.int32).max
+
+        with pytest.raises(ValueError):
+            export_beat_signal(tmp_path / 'empty.wav', t_start=1, t_end=1, num_points=1)
+        export_beat_signal(tmp_path / 'single.wav', t_start=1, t_end=1, num_points=1, sample_rate=8000)
+        with wave.open(str(tmp_path / 'single.wav'), 'rb') as wav:
+            assert wav.getnframes() == 1 and wav.getframerate() == 8000
+
+class TestBeatProducer:
+    """测试实时生产者"""
+
+    def test_read_matches_analytic_signal(self):
+        """按节奏读取时输出与解析信号一致且无欠载"""
+        async def consume():
+            async with BeatProducer(sample_rate=8000, block_size=200, buffer_blocks=4) as producer:
+                await asyncio.sleep(0.01)
+                chunks = []
+                for _ in range(10):
+                    chunks.append(await producer.read(20))
+                    await asyncio.sleep(0)
+                return np.concatenate(chunks), producer.stats()
+
+        signal, stats = asyncio.run(consume())
+        t = np.arange(1600) / 8000
+        assert np.allclose(signal, np.sin(2 * np.pi * 440 * t) + np.sin(2 * np.pi * 444 * t), atol=1e-9)
+        assert stats['underruns'] == 0 and stats['blocks'] == 8
+
+    def test_frequency_change_keeps_phase(self):
+        """修改频率后相位连续"""
+        producer = BeatProducer(f1=440, f2=444, sample_rate=8000, block_size=100)
+        first = producer.render_block()
+        producer.set_parameters(f2=500)
+        second = producer.render_block()
+        t = np.arange(100) / 8000
+        expected = np.sin(2 * np.pi * 440 * (t + 100 / 8000)) + np.sin(2 * np.pi * (444 * 100 / 8000 + 500 * t))
+        assert np.allclose(second, expected, atol=1e-9)
+        assert first.size == 100
+
 class TestParameterSensitivity:
     """测试参数敏感性分析"""
         
+    def test_sweep_matches_single_runs(self):
+        """参数扫描结果应与逐个调用 simulate_beat_frequency 一致"""
+        diffs, ratios = [1, 5, 10], [0.5, 2.0]
+        t, waves = sweep_beat_parameters(diffs, ratios, num_points=2000, chunk_rows=2)
+        assert waves.shape == (3, 2, 2000)
+        for i, diff in enumerate(diffs):
+            for j, ratio in enumerate(ratios):
+                _, wave, _ = simulate_beat_frequency(f2=440 + diff, A2=ratio, num_points=2000, show_plot=False)
+                assert np.array_equal(waves[i, j], wave)
+
     def test_waveform_properties(self):
         """测试波形基本属性"""
         t, wave, _ = simulate_beat_frequency(f1=440, f2=442, show_plot=False)
@@ -1,4 +1,9 @@
 import unittest
+from unittest import mock
+import json
+import tempfile
+import numpy as np
+from scipy.integrate import quad, trapezoid
 import sys
 import os
 
@@ -20,6 +25,25 @@ from src.maxwell_distribution import (
     percentage_3e4_to_3e8,
     vp
 )
+from src.maxwell_distribution import maxwell_cdf, maxwell_sf, interval_probability
+from src.maxwell_distribution import (
+    trapezoidal_rule,
+    trapezoid_vectorized,
+    simpson_vectorized,
+    gauss_legendre,
+    romberg_integrate,
+)
+from src.maxwell_distribution import maxwell_tail_bound, tail_aware_probability
+from src.maxwell_distribution import time_call, fit_convergence_order, benchmark_integrators
+from src.maxwell_distribution import (
+    most_probable_speed,
+    probability_table,
+    save_probability_table,
+    load_probability_table,
+)
+from src.maxwell_distribution import sample_maxwell_speeds, maxwell_histogram, histogram_deviation
+from src.maxwell_distribution import build_cdf_table, get_cdf_table, lookup_interval_probability
+from src.maxwell_distribution import speed_distribution, speed_cdf, speed_moments
 
 class TestMaxwellDistribution(unittest.TestCase):
 
@@ -40,5 +64,193 @@ class TestMaxwellDistribution(unittest.TestCase):
         percent = percentage_3e4_to_3e8(vp)
         self.assertAlmostEqual(percent, 0.0, places=6)
 
+class TestClosedForm(unittest.TestCase):
+
+    def test_matches_quad(self):
+        # 解析区间概率应与 quad 结果一致
+        self.assertAlmostEqual(interval_probability(0, vp, vp) * 100, percentage_0_to_vp(vp), places=10)
+        self.assertAlmostEqual(interval_probability(0, 3.3 * vp, vp) * 100, percentage_0_to_3_3vp(vp), places=10)
+        self.assertAlmostEqual(maxwell_cdf(np.inf, vp), 1.0)
+        self.assertAlmostEqual(maxwell_sf(0, vp), 1.0)
+
+    def test_vectorized_and_far_tail(self):
+        lower = np.array([0, 0.5, 5, 20]) * vp
+        upper = lower + 0.7 * vp
+        result = interval_probability(lower, upper, vp)
+        expected = [quad(maxwell_distribution, a, b, args=(vp,), epsabs=0, epsrel=1e-12)[0]
+                    for a, b in zip(lower, upper)]
+        np.testing.assert_allclose(result, expected, rtol=1e-9)
+        self.assertGreater(result[-1], 0)
+
+class TestFixedRuleIntegrators(unittest.TestCase):
+
+    def test_vectorized_rules(self):
+        exact = interval_probability(0, 2000, 2000)
+        # 向量化梯形公式与逐点循环结果一致, 且显式使用传入的 vp
+        self.assertAlmostEqual(trapezoid_vectorized(maxwell_distribution, 0, 2000, 100, args=(2000,)),
+                               trapezoidal_rule(maxwell_distribution, 0, 2000, 100, args=(2000,)), places=14)
+        for rule in (trapezoid_vectorized, simpson_vectorized, gauss_legendre):
+            # 分块大小不影响结果
+            result = rule(maxwell_distribution, 0, 2000, 1000, args=(2000,), chunk_size=333)
+            self.assertAlmostEqual(result, exact, places=12)
+        with self.assertRaises(ValueError):
+            simpson_vectorized(maxwell_distribution, 0, 2000, 11, args=(2000,))
+
+    def test_romberg_reuses_evaluations(self):
+        evaluated = []
+
+        def counted(v, vp):
+            evaluated.append(np.size(v))
+            return maxwell_distribution(v, vp)
+
+        result, evaluations = romberg_integrate(counted, 0, 3.3 * vp, args=(vp,), tol=1e-12)
+        self.assertAlmostEqual(result, interval_probability(0, 3.3 * vp, vp), places=11)
+        # 每个节点只求值一次, 次数为 2^L + 1
+        self.assertEqual(evaluations, sum(evaluated))
+        self.assertEqual(bin(evaluations - 1).count('1'), 1)
+        self.assertLess(evaluations, 1000)
+
+class TestTailAware(unittest.TestCase):
+
+    def test_tail_bound_is_rigorous(self):
+        v = np.linspace(0.1, 30, 300) * vp
+        self.assertTrue(np.all(maxwell_sf(v, vp) <= maxwell_tail_bound(v, vp)))
+
+    def test_sparse_range_is_free(self):
+        result, tail, evaluations = tail_aware_probability(3e4, 3e8, vp)
+        self.assertEqual(evaluations, 0)
+        self.assertLessEqual(interval_probability(3e4, 3e8, vp) - result, tail)
+
+    def test_truncated_range_within_bound(self):
+        for lower, upper in [(0, 3e8), (vp, np.inf)]:
+            result, tail, evaluations = tail_aware_probability(lower, upper, vp)
+            self.assertLess(evaluations, 5000)
+            self.assertLessEqual(abs(interval_probability(lower, upper, vp) - result), tail + 1e-13)
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_time_call_statistics(self):
+        stats = time_call(sum, range(100), warmup=1, repeat=7)
+        self.assertEqual(stats['repeat'], 7)
+        self.assertTrue(0 <= stats['min'] <= stats['median'] <= stats['max'])
+        self.assertGreaterEqual(stats['iqr'], 0)
+
+    def test_convergence_order_and_json(self):
+        self.assertAlmostEqual(fit_convergence_order([10, 20, 40], [1e-2, 2.5e-3, 6.25e-4]), 2.0)
+        exact = interval_probability(0, 3.3 * vp, vp)
+        methods = {'trapezoid': lambda v, n: trapezoid_vectorized(maxwell_distribution, 0, 3.3 * v, n, args=(v,)),
+                   'simpson': lambda v, n: simpson_vectorized(maxwell_distribution, 0, 3.3 * v, n, args=(v,))}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.json')
+            report = benchmark_integrators(methods, vp, exact, n_list=np.array([20, 40, 80]), warmup=0, repeat=3,
+                                           json_path=path)
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f)['n_list'], [20, 40, 80])
+        self.assertAlmostEqual(report['methods']['trapezoid']['convergence_order'], 2, delta=0.3)
+        self.assertAlmostEqual(report['methods']['simpson']['convergence_order'], 4, delta=0.5)
+
+class TestProbabilityTable(unittest.TestCase):
+
+    def test_table_matches_single_intervals(self):
+        molar_masses = [2.016e-3, 28e-3, 44e-3]
+        temperatures = [100, 300]
+        bands = [(0, 500), (500, 1500), (1500, 3e8)]
+        table = probability_table(molar_masses, temperatures, bands)
+        self.assertEqual(table.shape, (3, 2, 3))
+        v = most_probable_speed(28e-3, 300)
+        self.assertAlmostEqual(table[1, 1, 1], interval_probability(500, 1500, v))
+        np.testing.assert_allclose(table.sum(axis=2), 1.0)
+        quad_table = probability_table(molar_masses[:2], temperatures, bands[:2], method='quad')
+        np.testing.assert_allclose(quad_table, table[:2, :, :2], atol=1e-10)
+
+    def test_save_and_load(self):
+        table = probability_table([28e-3], [300], [(0, 500)])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'table.npz')
+            save_probability_table(path, table, [28e-3], [300], [(0, 500)])
+            data = load_probability_table(path)
+        self.assertEqual(data['table'].dtype, np.float32)
+        np.testing.assert_allclose(data['table'], table, rtol=1e-6)
+
+class TestSampler(unittest.TestCase):
+
+    def test_blocks_are_seeded_and_bounded(self):
+        blocks = list(sample_maxwell_speeds(vp, 2500, block_size=1000, seed=7))
+        self.assertEqual([b.size for b in blocks], [1000, 1000, 500])
+        again = np.concatenate(list(sample_maxwell_speeds(vp, 2500, block_size=1000, seed=7)))
+        np.testing.assert_array_equal(np.concatenate(blocks), again)
+
+    def test_float_total(self):
+        # 1e8 这样的整数值浮点数可以作为样本数, 非整数则报错
+        blocks = list(sample_maxwell_speeds(vp, 2.5e3, block_size=1000, seed=7))
+        self.assertEqual(sum(b.size for b in blocks), 2500)
+        with self.assertRaises(ValueError):
+            next(sample_maxwell_speeds(vp, 2.5))
+
+    def test_histogram_converges_to_density(self):
+        counts, edges = maxwell_histogram(vp, 400000, bins=50, block_size=65536, seed=0)
+        self.assertEqual(counts.sum(), 400000 - np.count_nonzero(
+            np.concatenate(list(sample_maxwell_speeds(vp, 400000, block_size=65536, seed=0))) > edges[-1]))
+        max_dev, chi2_per_dof = histogram_deviation(counts, edges, vp)
+        self.assertLess(max_dev, 3e-3)
+        self.assertLess(chi2_per_dof, 2.0)
+
+class TestCdfLookup(unittest.TestCase):
+
+    def test_lookup_within_error_bound(self):
+        bound = 2 * get_cdf_table()['error_bound']
+        self.assertLess(bound, 1e-9)
+        self.assertAlmostEqual(lookup_interval_probability(0.0, float(vp), vp), interval_probability(0, vp, vp),
+                               delta=bound)
+        lower = np.linspace(0, 5, 1000) * vp
+        upper = lower + np.linspace(0.01, 3, 1000) * vp
+        np.testing.assert_allclose(lookup_interval_probability(lower, upper, vp),
+                                   interval_probability(lower, upper, vp), rtol=0, atol=bound)
+
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cdf_table.npz')
+            built = build_cdf_table(num_nodes=257, cache_path=path)
+            loaded = build_cdf_table(num_nodes=257, cache_path=path)
+        np.testing.assert_array_equal(built['coeffs'], loaded['coeffs'])
+        self.assertEqual(built['error_bound'], loaded['error_bound'])
+
+    def test_disk_cache_suffix_and_parameters(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cdf')
+            built = build_cdf_table(num_nodes=257, cache_path=path)
+            self.assertTrue(os.path.exists(path + '.npz'))
+            # 无后缀路径第二次调用直接命中缓存, 不再构建
+            with mock.patch('src.maxwell_distribution.PchipInterpolator', side_effect=AssertionError):
+                loaded = build_cdf_table(num_nodes=257, cache_path=path)
+            np.testing.assert_array_equal(built['coeffs'], loaded['coeffs'])
+            # 参数不一致时重新构建
+            rebuilt = build_cdf_table(num_nodes=129, x_max=6.0, cache_path=path)
+            self.assertEqual(rebuilt['coeffs'].shape[0], 128)
+            self.assertEqual(rebuilt['x_max'], 6.0)
+
+class TestGeneralizedDistribution(unittest.TestCase):
+
+    def test_reduces_to_3d_maxwell(self):
+        v = np.linspace(0, 5 * vp, 1001)
+        np.testing.assert_allclose(speed_distribution(v, vp), maxwell_distribution(v, vp), atol=1e-18)
+        np.testing.assert_allclose(speed_cdf(v, vp), maxwell_cdf(v, vp), atol=1e-14)
+        moments = speed_moments(vp)
+        self.assertAlmostEqual(moments['most_probable'], vp)
+        self.assertAlmostEqual(moments['mean'], 2 * vp / np.sqrt(np.pi))
+        self.assertAlmostEqual(moments['rms'], np.sqrt(1.5) * vp)
+
+    def test_dimensions_and_mixture_moments(self):
+        v = np.linspace(0, 15 * vp, 200001)
+        for dim in (1, 2, 3):
+            for scales, weights in ((vp, None), ([vp, 3 * vp], [0.7, 0.3])):
+                density = speed_distribution(v, scales, dim, weights)
+                moments = speed_moments(scales, dim, weights)
+                self.assertAlmostEqual(trapezoid(density, v), 1.0, places=6)
+                self.assertAlmostEqual(speed_cdf(v[20000], scales, dim, weights),
+                                       trapezoid(density[:20001], v[:20001]), places=6)
+                self.assertAlmostEqual(trapezoid(v * density, v) / moments['mean'], 1.0, places=6)
+                self.assertAlmostEqual(v[np.argmax(density)], moments['most_probable'], delta=v[1])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,5 +1,8 @@
 import unittest
+import tempfile
+import tracemalloc
 import numpy as np
+import matplotlib.pyplot as plt
 import sys
 import os
 
@@ -8,6 +11,13 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 #from solutions.newton_rings_solution import setup_parameters, generate_grid, calculate_intensity, plot_newton_rings
 from src.newton_rings import setup_parameters, generate_grid, calculate_intensity, plot_newton_rings
+from src.newton_rings import calculate_intensity_fast, calculate_intensity_fast_grid, benchmark_intensity
+from src.newton_rings import film_thickness, calculate_intensity_open
+from src.newton_rings import render_newton_rings_tiled
+from src.newton_rings import calculate_intensity_spectral, blackbody_spectrum, wavelength_to_rgb
+from src.newton_rings import analyze_rings, analyze_rings_batch
+from src.newton_rings import ArrayCache, grid_cache, cached_radius_squared, sweep_newton_rings
+from src.newton_rings import downsample_area, ImagePyramid, PyramidImage
 
 class TestNewtonRingsSolution(unittest.TestCase):
 
@@ -33,5 +43,202 @@ class TestNewtonRingsSolution(unittest.TestCase):
         # 检查强度值是否在合理范围内
         self.assertTrue(np.all(intensity >= 0) and np.all(intensity <= 4.1))
 
+    def test_calculate_intensity_fast(self):
+        lambda_light, R_lens = setup_parameters()
+        X, Y, r = generate_grid()
+        exact = calculate_intensity(r, lambda_light, R_lens)
+        for method in ('linear', 'nearest'):
+            for tol in (1e-2, 1e-4):
+                fast = calculate_intensity_fast(r, lambda_light, R_lens, tol=tol, method=method)
+                self.assertEqual(fast.shape, exact.shape)
+                self.assertLessEqual(np.max(np.abs(fast - exact)), tol)
+        fast = calculate_intensity_fast(X**2 + Y**2, lambda_light, R_lens, squared=True)
+        self.assertLessEqual(np.max(np.abs(fast - exact)), 1e-3)
+
+    def test_calculate_intensity_fast_grid(self):
+        lambda_light, R_lens = setup_parameters()
+        X, Y, r = generate_grid(num_points=301)
+        exact = calculate_intensity(r, lambda_light, R_lens)
+        fast = calculate_intensity_fast_grid(lambda_light, R_lens, num_points=301)
+        self.assertLessEqual(np.max(np.abs(fast - exact)), 1e-3)
+        self.assertEqual(set(benchmark_intensity(num_points=64, repeat=1)), {'exact', 'fast (r)', 'fast (r^2)'})
+
+    def test_open_grid_low_memory(self):
+        lambda_light, R_lens = setup_parameters()
+
+        def peak_memory(func):
+            tracemalloc.start()
+            result = func()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak, result
+
+        dense_peak, dense = peak_memory(lambda: calculate_intensity(generate_grid()[2], lambda_light, R_lens))
+        X, Y, r = generate_grid(open_grid=True, dtype=np.float32)
+        self.assertEqual((X.shape, Y.shape, r), ((1, 1000), (1000, 1), None))
+        open_peak, intensity = peak_memory(lambda: calculate_intensity_open(X, Y, lambda_light, R_lens))
+        self.assertEqual(intensity.dtype, np.float32)
+        self.assertLess(open_peak * 3, dense_peak)
+        # 无相消的膜厚公式使 float32 结果保持精确
+        self.assertLess(np.max(np.abs(intensity - dense)), 1e-3)
+        r2 = np.float32([1e-6])
+        self.assertAlmostEqual(film_thickness(r2, R_lens)[0] / (R_lens - np.sqrt(R_lens**2 - 1e-6)), 1, places=6)
+        # 标量和整数输入
+        self.assertAlmostEqual(film_thickness(1e-6, 0.1) / (0.1 - np.sqrt(0.01 - 1e-6)), 1, places=9)
+        self.assertEqual(film_thickness(0, 0.1), 0.0)
+
+    def test_render_tiled(self):
+        lambda_light, R_lens = setup_parameters()
+        reference = calculate_intensity(generate_grid()[2], lambda_light, R_lens)
+        with tempfile.TemporaryDirectory() as tmp:
+            image, stats = render_newton_rings_tiled(os.path.join(tmp, 'full.npy'), 1000, lambda_light, R_lens,
+                                                     tile_size=300, workers=4)
+            self.assertEqual(stats['tiles'], 16)
+            self.assertLess(np.max(np.abs(image - reference)), 1e-3)
+            region, _ = render_newton_rings_tiled(os.path.join(tmp, 'part.npy'), 1000, lambda_light, R_lens,
+                                                  tile_size=64, region=(100, 300, 450, 777))
+            self.assertEqual(region.shape, (200, 327))
+            self.assertLess(np.max(np.abs(region - reference[100:300, 450:777])), 1e-3)
+            del image, region
+
+    def test_spectral_rendering(self):
+        lambda_light, R_lens = setup_parameters()
+        _, _, r = generate_grid()
+        r = r[::5, ::5]
+        # 单色光保持其色相: 强度按单色强度变化, 颜色为该波长截断负分量后的 RGB
+        for wavelength in (lambda_light, 500e-9):
+            mono = calculate_intensity_spectral(r, [wavelength], [1.0], R_lens)
+            self.assertEqual(mono.shape, r.shape + (3,))
+            hue = np.maximum(wavelength_to_rgb([wavelength])[0], 0)
+            hue /= hue.max()
+            expected = calculate_intensity(r, wavelength, R_lens)[..., None] / 2 * hue
+            self.assertLess(np.max(np.abs(mono - expected)), 2e-3)
+            self.assertGreaterEqual(mono.min(), 0)
+        # He-Ne 激光为红色
+        mono = calculate_intensity_spectral(r, [lambda_light], [1.0], R_lens)
+        self.assertAlmostEqual(mono[..., 1:].max(), 0)
+        self.assertGreater(mono[..., 0].max(), 1.9)
+        # 径向剖面路径与直接二维求和一致
+        wavelengths = np.linspace(380e-9, 780e-9, 81)
+        weights = blackbody_spectrum(wavelengths, 5500)
+        radial = calculate_intensity_spectral(r, wavelengths, weights, R_lens, chunk_size=16)
+        direct = calculate_intensity_spectral(r, wavelengths, weights, R_lens, chunk_size=16, radial=False)
+        self.assertLess(np.max(np.abs(radial - direct)), 2e-3)
+        # 按字节预算分块的结果与不分块一致
+        blocked = calculate_intensity_spectral(r, wavelengths, weights, R_lens, chunk_size=16, radial=False,
+                                               cache_bytes=64 * 1024)
+        np.testing.assert_allclose(blocked, direct, atol=1e-12)
+        # 远离中心处趋于光源本身的颜色: 最亮通道约为 1, 5500 K 黑体在 sRGB 中偏暖
+        np.testing.assert_allclose(radial[0, 0].max(), 1.0, atol=0.05)
+        self.assertGreater(radial[0, 0, 0], radial[0, 0, 2])
+        self.assertTrue(np.all(wavelength_to_rgb([550e-9])[0, 1] > wavelength_to_rgb([450e-9, 650e-9])[:, 1]))
+
+    def test_spectral_direct_memory_bounded(self):
+        lambda_light, R_lens = setup_parameters()
+        r = generate_grid(num_points=500)[2]
+        wavelengths = np.linspace(380e-9, 780e-9, 64)
+        tracemalloc.start()
+        rgb = calculate_intensity_spectral(r, wavelengths, np.ones(64), R_lens, radial=False,
+                                           cache_bytes=8 * 1024 * 1024)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        # 不分块时一批波长的临时数组为 64 x 250000 个 float64 (128 MB)
+        self.assertLess(peak, 8 * 1024 * 1024 + 4 * rgb.nbytes)
+
+    def test_analyze_rings(self):
+        lambda_light, R_lens = setup_parameters()
+        _, _, r = generate_grid()
+        pixel_size = 0.002 / 999
+        image = calculate_intensity(r, lambda_light, R_lens)
+        result = analyze_rings(image, pixel_size, lambda_light=lambda_light)
+        self.assertAlmostEqual(result['R_lens'], R_lens, delta=1e-4)
+        # 第一个暗环 r_1 = sqrt(lambda * R)
+        self.assertAlmostEqual(result['radii'][0], np.sqrt(lambda_light * R_lens), delta=2 * pixel_size)
+        noisy = image + np.random.default_rng(0).normal(0, 0.5, image.shape)
+        results = analyze_rings_batch([noisy, image], pixel_size, R_lens=R_lens, processes=2)
+        for res in results:
+            self.assertAlmostEqual(res['lambda_light'], lambda_light, delta=1e-9)
+
+    def test_configurable_grid(self):
+        X, Y, r = generate_grid(half_width=0.002, num_points=301)
+        self.assertEqual(r.shape, (301, 301))
+        self.assertAlmostEqual(X[0, 0], -0.002)
+        self.assertLess(r[150, 150], 1e-12)
+
+    def test_grid_cache_eviction(self):
+        cache = ArrayCache(max_bytes=1000)
+        cache.get('a', lambda: np.zeros(100))
+        cache.get('b', lambda: np.zeros(100))
+        self.assertEqual(cache.stats()['entries'], 1)
+        self.assertFalse(cache.get('b', lambda: None).flags.writeable)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_sweep_reuses_geometry(self):
+        grid_cache.clear()
+        parameters = [(600e-9, 0.1), (632.8e-9, 0.1), (632.8e-9, 0.2)]
+        stack = sweep_newton_rings(parameters, half_width=0.001, num_points=200)
+        self.assertEqual(stack.shape, (3, 200, 200))
+        _, _, r = generate_grid(num_points=200)
+        for intensity, (lambda_light, R_lens) in zip(stack, parameters):
+            self.assertLess(np.max(np.abs(intensity - calculate_intensity(r, lambda_light, R_lens))), 1e-8)
+        # r^2 计算一次, 每个 R_lens 的膜厚各计算一次
+        self.assertEqual(grid_cache.misses, 3)
+        self.assertIs(cached_radius_squared(0.001, 200), cached_radius_squared(0.001, 200))
+        radii, profiles = sweep_newton_rings(parameters, num_points=200, profiles_only=True)
+        self.assertEqual(profiles.shape, (3, 200))
+
+    def test_image_pyramid(self):
+        image = np.arange(36, dtype=float).reshape(6, 6)
+        half = downsample_area(image)
+        self.assertEqual(half.shape, (3, 3))
+        self.assertAlmostEqual(half.mean(), image.mean())
+        self.assertEqual(downsample_area(np.ones((5, 7))).shape, (3, 4))
+
+        lambda_light, R_lens = setup_parameters()
+        _, _, r = generate_grid()
+        pyramid = ImagePyramid(calculate_intensity(r, lambda_light, R_lens), min_size=64)
+        self.assertEqual(pyramid.num_levels, 5)
+        self.assertEqual(len(pyramid.levels), 1)
+        # 视野为全图时选择分辨率与屏幕相当的最粗一级, 放大后选择更细的级别
+        self.assertEqual(pyramid.select_level((1, 1), (250, 250)), 2)
+        self.assertEqual(pyramid.select_level((0.1, 0.1), (250, 250)), 0)
+        extent = (-0.001, 0.001, -0.001, 0.001)
+        data, data_extent = pyramid.crop(2, extent, (-0.0005, 0.0005), (0, 0.001))
+        # 视野边界落在像素中间时包含整个边界像素
+        self.assertEqual(data.shape, (126, 126))
+        np.testing.assert_allclose(data_extent, (-0.000504, 0.000504, -0.000008, 0.001))
+        # 未计算的级别只对视野内区域降采样, 结果与整级计算后裁剪一致
+        self.assertEqual(len(pyramid.levels), 1)
+        np.testing.assert_allclose(data, pyramid.level(2)[0:126, 62:188])
+        self.assertEqual(pyramid.shape(4), pyramid.level(4).shape)
+        np.testing.assert_allclose(pyramid.level(3), downsample_area(pyramid.level(2)))
+
+    def test_pyramid_image_crops_once_per_view(self):
+        lambda_light, R_lens = setup_parameters()
+        _, _, r = generate_grid()
+        extent = (-0.001, 0.001, -0.001, 0.001)
+        fig, ax = plt.subplots(figsize=(2.5, 2.5), dpi=100)
+        ax.set_xlim(extent[0], extent[1])
+        ax.set_ylim(extent[2], extent[3])
+        image = PyramidImage(ax, calculate_intensity(r, lambda_light, R_lens), extent, cmap='gray')
+        ax.add_image(image)
+        crops = []
+        crop = image.pyramid.crop
+        image.pyramid.crop = lambda *args: crops.append(args[0]) or crop(*args)
+        fig.canvas.draw()
+        # 同时修改 x 和 y 范围 (如框选缩放) 只在下次绘制时裁剪一次, 视野不变时不再裁剪
+        ax.set_xlim(-0.0005, 0.0005)
+        ax.set_ylim(-0.0005, 0.0005)
+        fig.canvas.draw()
+        fig.canvas.draw()
+        self.assertEqual(len(crops), 2)
+        # 放大后选择更细的级别, 但只计算了视野内的子图, 没有生成完整的该级
+        self.assertGreater(crops[0], crops[1])
+        self.assertGreater(crops[1], 0)
+        self.assertNotIn(crops[1], image.pyramid.levels)
+        rows, cols = image.pyramid.shape(crops[1])
+        self.assertLessEqual(image.get_array().shape[1], cols // 2 + 2)
+        plt.close(fig)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -8,6 +8,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 #from solutions.spring_block_solution import solve_ode_euler, spring_mass_ode_func, solve_ode_odeint
 from src.spring_block import solve_ode_euler, spring_mass_ode_func, solve_ode_odeint
+from src.spring_block import euler_propagator, solve_ode_euler_propagator
 
 def test_solve_ode_euler():
     """测试欧拉法求解器"""
@@ -69,5 +70,18 @@ def test_solve_ode_odeint():
     assert np.allclose(energy, energy[0], rtol=0.05, atol=1e-6)
 
 
+def test_solve_ode_euler_propagator():
+    """测试传播矩阵求解器与逐步欧拉法一致"""
+    A = euler_propagator(k=2.0, m=0.5, damping=0.1, time_step=0.01)
+    assert np.allclose(A @ [1.0, 2.0], [1.0 + 0.02, 2.0 - (2.0 * 1.0 + 0.1 * 2.0) / 0.5 * 0.01])
+
+    for step_num, k, m, damping in [(100, 1.0, 1.0, 0.0), (1001, 3.0, 2.0, 0.5), (20000, 1.0, 1.0, 0.0)]:
+        time_loop, position_loop, velocity_loop = solve_ode_euler(step_num, k, m, damping)
+        time_prop, position_prop, velocity_prop = solve_ode_euler_propagator(step_num, k, m, damping)
+        assert np.array_equal(time_loop, time_prop)
+        assert np.allclose(position_prop, position_loop, rtol=0, atol=1e-11)
+        assert np.allclose(velocity_prop, velocity_loop, rtol=0, atol=1e-11)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file